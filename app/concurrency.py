@@ -0,0 +1,213 @@
+"""
+Concurrency helpers for calling the Mistral API.
+
+Handles:
+- Client-side rate limiting (stay under the tier's RPM ceiling)
+- Adaptive (AIMD) concurrency limits that back off when throttled
+- Retry with exponential backoff and jitter on rate-limit/transient errors
+"""
+
+import time
+import random
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from mistralai.models import SDKError
+
+T = TypeVar("T")
+
+# Statuses worth retrying: rate limiting and transient server failures
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class AsyncRateLimiter:
+    """
+    Leaky-bucket limiter allowing max_rate acquisitions per time_period.
+
+    Waiting here is much cheaper than an HTTP 429 round-trip followed
+    by a backoff sleep.
+
+    Usage:
+        limiter = AsyncRateLimiter(500, 60)  # 500 requests/minute
+        async with limiter:
+            await client.chat.complete_async(...)
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _leak(self):
+        """Drain the bucket according to elapsed time."""
+        now = time.monotonic()
+        elapsed = now - self._last_check
+        self._level = max(0.0, self._level - elapsed * self._rate_per_sec)
+        self._last_check = now
+
+    async def acquire(self):
+        """Wait until a request slot is available."""
+        # The lock keeps waiters FIFO so nobody starves
+        async with self._lock:
+            while True:
+                self._leak()
+                if self._level + 1 <= self.max_rate:
+                    self._level += 1
+                    return
+                await asyncio.sleep(
+                    (self._level + 1 - self.max_rate) / self._rate_per_sec
+                )
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+class AdaptiveSemaphore:
+    """
+    Concurrency limit tuned by AIMD (additive increase, multiplicative decrease).
+
+    The limit grows by one after increase_every consecutive successes, up to
+    max_limit, and halves when the API signals throttling (429 or timeout).
+    Lowering the limit never cancels work: new acquisitions wait until the
+    in-flight count drains below it.
+
+    Usage:
+        sem = AdaptiveSemaphore(3, max_limit=16)
+        async with sem:
+            await client.chat.complete_async(...)  # a 429 here halves the limit
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        max_limit: Optional[int] = None,
+        min_limit: int = 1,
+        increase_every: int = 5,
+        cooldown: float = 1.0
+    ):
+        self.limit = max(min_limit, initial)
+        self.max_limit = max(self.limit, max_limit or self.limit)
+        self.min_limit = min_limit
+        self.increase_every = increase_every
+        # Concurrent requests tend to get throttled together; one burst of
+        # 429s should halve the limit once, not once per request
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._streak = 0
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self):
+        """Wait until fewer than limit requests are in flight."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, success: bool = True):
+        """Free a slot, growing the limit after a streak of successes."""
+        async with self._cond:
+            self._in_flight -= 1
+            if success:
+                self._streak += 1
+                if self._streak >= self.increase_every and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+    def record_throttle(self):
+        """Halve the limit after a rate-limit or timeout signal."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self.limit = max(self.min_limit, self.limit // 2)
+        self._streak = 0
+        self._last_decrease = now
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc is not None and is_throttle_error(exc):
+            self.record_throttle()
+        await self.release(success=exc is None)
+        return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for HTTP 429 responses from the Mistral API."""
+    return isinstance(exc, SDKError) and exc.status_code == 429
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for HTTP 429 and 5xx gateway/server errors from the Mistral API."""
+    return isinstance(exc, SDKError) and exc.status_code in TRANSIENT_STATUS_CODES
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """True for errors that mean the API wants less concurrency."""
+    return is_rate_limit_error(exc) or isinstance(
+        exc, (asyncio.TimeoutError, httpx.TimeoutException)
+    )
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Seconds requested by the server's Retry-After header, if any."""
+    response = getattr(exc, "raw_response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        # HTTP-date form is rare for this API; fall back to backoff
+        return None
+
+
+async def with_retry(
+    call: Callable[[], Awaitable[T]],
+    attempts: int = 5,
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0,
+    retry_on: Callable[[BaseException], bool] = is_rate_limit_error,
+    on_retry: Optional[Callable[[BaseException], None]] = None
+) -> T:
+    """
+    Await call(), retrying with exponential backoff and jitter.
+
+    A Retry-After header on the error takes precedence over the backoff.
+
+    Args:
+        call: Zero-argument coroutine factory (re-invoked on each attempt)
+        attempts: Total number of attempts
+        initial_delay: Backoff base in seconds
+        max_delay: Upper bound on a single backoff sleep
+        retry_on: Predicate selecting which exceptions are retryable
+        on_retry: Called with each exception that is about to be retried
+    """
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == attempts - 1 or not retry_on(e):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                await asyncio.sleep(min(max_delay, retry_after))
+                continue
+            delay = min(max_delay, initial_delay * 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, initial_delay))
@@ -13,56 +13,272 @@ Evaluation criteria:
 """
 
 import os
-import json
-import re
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
+import httpx
+import orjson
 from dotenv import load_dotenv
 from mistralai import Mistral
 
-from app.schemas import QualityScore, ExpectedStyle
+from app.schemas import QualityScore, ExpectedStyle, JudgeOutput, JudgeBatchOutput
+from app.evaluator_cache import InMemoryLLMCache, LLMCache, get_default_cache, make_cache_key
+from app.concurrency import AsyncRateLimiter, with_retry
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-# Evaluation prompt template - this is the core of LLM-as-judge
-EVALUATION_PROMPT = """You are an expert evaluator of AI-generated responses. 
+# Judge sampling temperature - kept low so verdicts are cacheable
+JUDGE_TEMPERATURE = 0.1
+
+# Judge criteria and fallback weights (accuracy and completeness weighted higher)
+CRITERIA_KEYS = ("clarity", "accuracy", "completeness", "relevance", "style_match")
+CRITERIA_WEIGHTS = (0.15, 0.30, 0.25, 0.15, 0.15)
+
+# JSON mode: Mistral guarantees the reply body is a parseable JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# One client per API key, shared by all evaluator instances so the
+# underlying httpx connection pool stays warm across requests
+_CLIENT_CACHE: dict[str, Mistral] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str) -> Mistral:
+    """Return the shared Mistral client for this API key."""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        with _CLIENT_LOCK:
+            client = _CLIENT_CACHE.get(api_key)
+            if client is None:
+                client = Mistral(
+                    api_key=api_key,
+                    async_client=httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=100,
+                            max_keepalive_connections=50
+                        )
+                    )
+                )
+                _CLIENT_CACHE[api_key] = client
+    return client
+
+
+# The RPM quota belongs to the API key, so evaluators sharing a key share
+# one limiter too (the first rpm given for a key is the one used)
+_LIMITER_CACHE: dict[str, AsyncRateLimiter] = {}
+
+
+def _get_limiter(api_key: str, rpm: int) -> AsyncRateLimiter:
+    """Return the shared rate limiter for this API key."""
+    limiter = _LIMITER_CACHE.get(api_key)
+    if limiter is None:
+        with _CLIENT_LOCK:
+            limiter = _LIMITER_CACHE.get(api_key)
+            if limiter is None:
+                limiter = AsyncRateLimiter(rpm, 60)
+                _LIMITER_CACHE[api_key] = limiter
+    return limiter
+
+
+async def close_clients():
+    """Close the shared clients' connection pools (call on app shutdown)."""
+    with _CLIENT_LOCK:
+        clients = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+        _LIMITER_CACHE.clear()
+    for client in clients:
+        await client.sdk_configuration.async_client.aclose()
+
+
+async def _complete(client: Mistral, limiter: AsyncRateLimiter, **kwargs):
+    """Rate-limited judge call, retried with jittered backoff on HTTP 429."""
+    async def call():
+        async with limiter:
+            return await client.chat.complete_async(**kwargs)
+    
+    return await with_retry(call)
+
+
+# Judge call metrics are handed off to a background writer so recording
+# them never blocks the evaluation path
+_metrics_queue: Optional[asyncio.Queue] = None
+_metrics_task: Optional[asyncio.Task] = None
+
+
+async def _metrics_writer(queue: asyncio.Queue):
+    """Drain judge metrics to the log."""
+    while True:
+        event = await queue.get()
+        logger.info(
+            "judge_call model=%s latency_ms=%.1f cached=%s",
+            event["model"], event["latency_ms"], event["cached"]
+        )
+
+
+def _record_judge_metric(model: str, latency_ms: float, cached: bool):
+    """Queue a judge metric without waiting; dropped if the queue is full."""
+    global _metrics_queue, _metrics_task
+    if _metrics_task is None or _metrics_task.done():
+        # (Re)start lazily on the running loop
+        _metrics_queue = asyncio.Queue(maxsize=10_000)
+        _metrics_task = asyncio.create_task(_metrics_writer(_metrics_queue))
+    try:
+        _metrics_queue.put_nowait(
+            {"model": model, "latency_ms": latency_ms, "cached": cached}
+        )
+    except asyncio.QueueFull:
+        pass
+
+
+class _JSONObjectScanner:
+    """
+    Incrementally tracks brace depth of a streamed JSON object.
+    
+    Braces inside string literals are ignored, so feedback text
+    containing "{" or "}" doesn't end the object early.
+    """
+    
+    __slots__ = ("depth", "in_string", "escaped")
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> int:
+        """Consume text; return the index just past the closing brace, or -1."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+# Keeps references to stream-draining tasks until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _drain(stream):
+    """Consume the rest of a stream so its connection returns to the pool."""
+    try:
+        async for _ in stream:
+            pass
+    except Exception:
+        pass
+
+
+async def _stream_json(client: Mistral, limiter: AsyncRateLimiter, **kwargs) -> str:
+    """
+    Stream a judge call and return as soon as the JSON object closes.
+    
+    The remaining events (usage, [DONE]) are drained in the background.
+    """
+    async def call():
+        async with limiter:
+            stream = await client.chat.stream_async(**kwargs)
+        
+        parts = []
+        scanner = _JSONObjectScanner()
+        async for chunk in stream:
+            choices = chunk.data.choices
+            if not choices or not choices[0].delta.content:
+                continue
+            text = choices[0].delta.content
+            end = scanner.feed(text)
+            if end != -1:
+                parts.append(text[:end])
+                task = asyncio.create_task(_drain(stream))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+                break
+            parts.append(text)
+        
+        return "".join(parts)
+    
+    return await with_retry(call)
+
+
+# Judge instructions - this is the core of LLM-as-judge. Everything here is
+# static per expected style, so it goes in the system message where the
+# provider can reuse the prefill across calls sharing that style.
+JUDGE_SYSTEM_PROMPT = """You are an expert evaluator of AI-generated responses. 
 Your task is to evaluate the quality of a response given a prompt and expected style.
+Be fair but critical. A score of 7-8 is good, 9-10 is exceptional.
 
-## Evaluation Criteria (score 0-10 for each):
+Reply with a JSON object scoring each criterion 0-10, plus "overall_score" and "feedback" (2-3 sentences):
 
-1. **Clarity** (0-10): How clear, well-structured, and easy to understand is the response?
-2. **Accuracy** (0-10): How accurate, factually correct, and reliable is the information?
-3. **Completeness** (0-10): How complete and comprehensive is the response? Does it fully address the prompt?
-4. **Relevance** (0-10): How relevant and on-topic is the response?
-5. **Style Match** (0-10): How well does the response match the expected style: "{expected_style}"?
+- "clarity": How clear, well-structured, and easy to understand is the response?
+- "accuracy": How accurate, factually correct, and reliable is the information?
+- "completeness": How complete and comprehensive is the response? Does it fully address the prompt?
+- "relevance": How relevant and on-topic is the response?
+- "style_match": How well does the response match the expected style: "{expected_style}"?
+"""
 
-## Input
+# Per-call part of the judge prompt, sent as the user message
+EVALUATION_PROMPT = """## Input
 
 **Prompt:** {prompt}
 
-**Expected Style:** {expected_style}
-
 **Response to Evaluate:**
 {response}
+{reference_section}"""
 
-{reference_section}
+# User message for row-marshaled judging: several items, one call
+MARSHALED_EVALUATION_PROMPT = """Evaluate each of the {count} items below independently.
+Reply with a JSON object {{"results": [...]}} holding one evaluation object per item, in item order.
 
-## Output Format
+{items}"""
 
-Respond ONLY with a valid JSON object in this exact format:
-{{
-    "clarity": <score>,
-    "accuracy": <score>,
-    "completeness": <score>,
-    "relevance": <score>,
-    "style_match": <score>,
-    "overall_score": <weighted_average>,
-    "feedback": "<2-3 sentence summary of strengths and areas for improvement>"
-}}
 
-Be fair but critical. A score of 7-8 is good, 9-10 is exceptional.
+def _reference_section(reference_answer: Optional[str]) -> str:
+    """Format the optional reference answer block of the judge prompt."""
+    if not reference_answer:
+        return ""
+    return f"""
+**Reference Answer (for comparison):**
+{reference_answer}
+
+Consider the reference when evaluating accuracy and completeness.
 """
 
+# System messages are built once per known style
+_JUDGE_SYSTEM_MESSAGES = {
+    style.value: {
+        "role": "system",
+        "content": JUDGE_SYSTEM_PROMPT.format(expected_style=style.value)
+    }
+    for style in ExpectedStyle
+}
+
+
+def _judge_system_message(style_value: str) -> dict:
+    """Return the judge system message for a style."""
+    message = _JUDGE_SYSTEM_MESSAGES.get(style_value)
+    if message is None:
+        message = {
+            "role": "system",
+            "content": JUDGE_SYSTEM_PROMPT.format(expected_style=style_value)
+        }
+    return message
+
 
 class LLMEvaluator:
     """
@@ -71,12 +287,25 @@ class LLMEvaluator:
     This technique (LLM-as-judge) is widely used in production
     because it scales better than human evaluation while providing
     nuanced quality assessment.
+    
+    Tiered judging: when cheap_model is set, every response is first
+    scored by the cheap model and only borderline verdicts (close to the
+    5.0 midpoint, flagged as uncertain, or unparseable) are re-judged by
+    judge_model. This trades a little accuracy on clear-cut cases for a
+    large cut in cost and latency. Keep cheap_model different from the
+    evaluated model to preserve judge/model separation.
     """
     
     def __init__(
         self, 
         api_key: Optional[str] = None,
-        judge_model: str = "mistral-large-latest"
+        judge_model: str = "mistral-large-latest",
+        max_concurrency: int = 16,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = True,
+        rpm: int = 500,
+        cheap_model: Optional[str] = None,
+        escalation_threshold: float = 1.5
     ):
         """
         Initialize the evaluator.
@@ -84,13 +313,26 @@ class LLMEvaluator:
         Args:
             api_key: Mistral API key
             judge_model: Model to use for evaluation (should be capable)
+            max_concurrency: Max concurrent judge calls in evaluate_many
+                (tune to your Mistral tier)
+            cache: Cache backend for judge outputs (defaults to the shared one)
+            use_cache: Set to False to always call the judge
+            rpm: Requests per minute allowed by your Mistral tier
+            cheap_model: Optional first-pass judge (e.g. mistral-small-latest)
+            escalation_threshold: Escalate to judge_model when the cheap
+                verdict is within this distance of 5.0
         """
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise ValueError("Mistral API key required")
         
-        self.client = Mistral(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
         self.judge_model = judge_model
+        self.max_concurrency = max_concurrency
+        self.cache = (cache or get_default_cache()) if use_cache else None
+        self._limiter = _get_limiter(self.api_key, rpm)
+        self.cheap_model = cheap_model
+        self.escalation_threshold = escalation_threshold
     
     async def evaluate(
         self,
@@ -111,117 +353,443 @@ class LLMEvaluator:
         Returns:
             QualityScore with detailed breakdown
         """
-        # Build reference section if provided
-        reference_section = ""
-        if reference_answer:
-            reference_section = f"""
-**Reference Answer (for comparison):**
-{reference_answer}
-
-Consider the reference when evaluating accuracy and completeness.
-"""
+        if self.cheap_model is None:
+            return await self._judge(
+                self.judge_model, prompt, response, expected_style, reference_answer
+            )
         
-        # Format evaluation prompt
-        style_value = expected_style.value if hasattr(expected_style, 'value') else expected_style
+        quality_score = await self._judge(
+            self.cheap_model, prompt, response, expected_style, reference_answer
+        )
+        if self._needs_escalation(quality_score):
+            quality_score = await self._judge(
+                self.judge_model, prompt, response, expected_style, reference_answer
+            )
+        return quality_score
+    
+    def _needs_escalation(self, quality_score: QualityScore) -> bool:
+        """Whether a cheap-judge verdict is too borderline to trust."""
+        return (
+            not quality_score.criteria_scores
+            or abs(quality_score.score - 5.0) < self.escalation_threshold
+            or "uncertain" in quality_score.feedback.lower()
+        )
+    
+    async def _judge(
+        self,
+        judge_model: str,
+        prompt: str,
+        response: str,
+        expected_style: ExpectedStyle,
+        reference_answer: Optional[str]
+    ) -> QualityScore:
+        """Score a response with a specific judge model."""
+        start = time.perf_counter()
+        style_value = getattr(expected_style, 'value', expected_style)
+        
+        # Identical inputs yield the same verdict at judge temperature
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(
+                judge_model, prompt, response, style_value, reference_answer
+            )
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                _record_judge_metric(
+                    judge_model, (time.perf_counter() - start) * 1000, cached=True
+                )
+                return QualityScore(**cached)
+        
+        # Only the per-call part is formatted; the criteria live in the
+        # cached system message
         eval_prompt = EVALUATION_PROMPT.format(
             prompt=prompt,
             response=response,
-            expected_style=style_value,
-            reference_section=reference_section
+            reference_section=_reference_section(reference_answer)
         )
         
-        # Call the judge model
-        judge_response = await self.client.chat.complete_async(
-            model=self.judge_model,
+        # Call the judge model, parsing as soon as the JSON object closes
+        eval_text = await _stream_json(
+            self.client,
+            self._limiter,
+            model=judge_model,
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert AI response evaluator. Always respond with valid JSON."
-                },
+                _judge_system_message(style_value),
                 {
                     "role": "user",
                     "content": eval_prompt
                 }
             ],
-            temperature=0.1,  # Low temperature for consistent evaluation
-            max_tokens=500
+            temperature=JUDGE_TEMPERATURE,  # Low temperature for consistent evaluation
+            max_tokens=500,
+            response_format=JSON_RESPONSE_FORMAT
         )
         
         # Parse the evaluation
-        return self._parse_evaluation(judge_response.choices[0].message.content)
+        quality_score = self._parse_evaluation(eval_text)
+        
+        # Don't cache parse failures - a retry may succeed
+        if cache_key is not None and quality_score.criteria_scores:
+            await self._cache_set(cache_key, quality_score.model_dump())
+        
+        _record_judge_metric(
+            judge_model, (time.perf_counter() - start) * 1000, cached=False
+        )
+        return quality_score
     
-    def _parse_evaluation(self, eval_text: str) -> QualityScore:
-        """Parse LLM evaluation output into QualityScore."""
-        try:
-            # Try to extract JSON from the response
-            # Handle case where LLM wraps in markdown code blocks
-            json_match = re.search(r'\{[^{}]*\}', eval_text, re.DOTALL)
-            if json_match:
-                eval_data = json.loads(json_match.group())
-            else:
-                eval_data = json.loads(eval_text)
-            
-            # Extract criteria scores
-            criteria_scores = {
-                "clarity": float(eval_data.get("clarity", 5)),
-                "accuracy": float(eval_data.get("accuracy", 5)),
-                "completeness": float(eval_data.get("completeness", 5)),
-                "relevance": float(eval_data.get("relevance", 5)),
-                "style_match": float(eval_data.get("style_match", 5))
-            }
+    async def _cache_get(self, key: str) -> Optional[dict]:
+        """
+        Cache lookup. Backends other than the in-memory LRU (file, Redis)
+        block on I/O, so they run in a worker thread.
+        """
+        if isinstance(self.cache, InMemoryLLMCache):
+            return self.cache.get(key)
+        return await asyncio.to_thread(self.cache.get, key)
+    
+    async def _cache_set(self, key: str, value: dict):
+        """Cache store, kept off the event loop like _cache_get."""
+        if isinstance(self.cache, InMemoryLLMCache):
+            self.cache.set(key, value)
+        else:
+            await asyncio.to_thread(self.cache.set, key, value)
+    
+    @staticmethod
+    def _cache_key(
+        judge_model: str,
+        prompt: str,
+        response: str,
+        style_value: str,
+        reference_answer: Optional[str]
+    ) -> str:
+        """Cache key of a single-row verdict (shared by all judge paths)."""
+        return make_cache_key(
+            kind="evaluate",
+            model=judge_model,
+            temperature=JUDGE_TEMPERATURE,
+            prompt=prompt,
+            response=response,
+            style=style_value,
+            ref=reference_answer
+        )
+    
+    async def evaluate_many(
+        self,
+        items: list[tuple[str, str, ExpectedStyle, Optional[str]]],
+        max_concurrency: Optional[int] = None,
+        checkpoint_path: Optional[str | Path] = None
+    ) -> list[QualityScore | BaseException]:
+        """
+        Evaluate several responses concurrently.
+        
+        Judge calls are network-bound, so overlapping them brings total
+        runtime close to the slowest call instead of the sum of all calls.
+        
+        Args:
+            items: (prompt, response, expected_style, reference_answer) tuples
+            max_concurrency: Max in-flight judge calls (defaults to the
+                value given to the constructor)
+            checkpoint_path: Optional JSONL file recording finished items.
+                On a re-run, items already in the file are not re-judged.
+        
+        Returns:
+            QualityScore per item, in input order. Failed items hold the
+            raised exception instead.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        completed: dict[str, QualityScore] = {}
+        checkpoint_file = None
+        write_lock = asyncio.Lock()
+        if checkpoint_path is not None:
+            checkpoint_path = Path(checkpoint_path)
+            torn_tail = False
+            if checkpoint_path.exists():
+                with open(checkpoint_path, "rb") as f:
+                    for line in f:
+                        torn_tail = not line.endswith(b"\n")
+                        try:
+                            record = orjson.loads(line)
+                            completed[record["key"]] = QualityScore(**record["score"])
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Torn write from a crashed run
+            checkpoint_file = open(checkpoint_path, "ab")
+            if torn_tail:
+                # Terminate the partial line, or the next record would be
+                # appended to it and lost as well
+                checkpoint_file.write(b"\n")
+        
+        def item_key(item) -> str:
+            prompt, response, expected_style, reference_answer = item
+            return make_cache_key(
+                model=self.judge_model,
+                prompt=prompt,
+                response=response,
+                style=getattr(expected_style, "value", expected_style),
+                ref=reference_answer
+            )
+        
+        async def evaluate_with_semaphore(item):
+            prompt, response, expected_style, reference_answer = item
+            key = item_key(item) if checkpoint_file else None
+            if key in completed:
+                return completed[key]
             
-            # Get overall score (or calculate weighted average)
-            if "overall_score" in eval_data:
-                overall = float(eval_data["overall_score"])
-            else:
-                # Weighted average: accuracy and completeness weighted higher
-                weights = {
-                    "clarity": 0.15,
-                    "accuracy": 0.30,
-                    "completeness": 0.25,
-                    "relevance": 0.15,
-                    "style_match": 0.15
-                }
-                overall = sum(
-                    criteria_scores[k] * weights[k] 
-                    for k in criteria_scores
+            async with semaphore:
+                quality_score = await self.evaluate(
+                    prompt=prompt,
+                    response=response,
+                    expected_style=expected_style,
+                    reference_answer=reference_answer
                 )
             
-            feedback = eval_data.get("feedback", "Evaluation completed.")
+            # Parse failures aren't checkpointed so a resume retries them
+            if checkpoint_file and quality_score.criteria_scores:
+                line = orjson.dumps({"key": key, "score": quality_score.model_dump()})
+                async with write_lock:
+                    checkpoint_file.write(line + b"\n")
+                    checkpoint_file.flush()
+            return quality_score
+        
+        try:
+            tasks = [evaluate_with_semaphore(item) for item in items]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if checkpoint_file:
+                checkpoint_file.close()
+    
+    async def evaluate_marshaled(
+        self,
+        items: list[tuple[str, str, ExpectedStyle, Optional[str]]],
+        batch_size: int = 8,
+        max_concurrency: Optional[int] = None
+    ) -> list[QualityScore | BaseException]:
+        """
+        Evaluate several responses, packing up to batch_size rows per judge call.
+        
+        Trades extra input tokens for batch_size-times fewer round-trips,
+        which helps when the RPM ceiling rather than tokens is the limit.
+        Rows are grouped by expected style so they share a system message.
+        Keep batch_size small (<= 8): judge latency and quality degrade
+        quickly on longer multi-item prompts.
+        
+        Always uses judge_model (no cheap-model tiering). A group whose
+        reply doesn't parse, or has the wrong number of verdicts, is
+        re-judged row by row.
+        
+        Returns:
+            QualityScore per item, in input order. Failed items hold the
+            raised exception instead.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        results: list[QualityScore | BaseException | None] = [None] * len(items)
+        
+        # Serve cached rows first; only the misses are marshaled
+        by_style: dict[str, list[int]] = {}
+        for i, (prompt, response, expected_style, reference_answer) in enumerate(items):
+            style_value = getattr(expected_style, 'value', expected_style)
+            if self.cache is not None:
+                cached = await self._cache_get(self._cache_key(
+                    self.judge_model, prompt, response, style_value, reference_answer
+                ))
+                if cached is not None:
+                    results[i] = QualityScore(**cached)
+                    continue
+            by_style.setdefault(style_value, []).append(i)
+        
+        async def judge_row(i: int):
+            prompt, response, expected_style, reference_answer = items[i]
+            async with semaphore:
+                try:
+                    results[i] = await self.evaluate(
+                        prompt=prompt,
+                        response=response,
+                        expected_style=expected_style,
+                        reference_answer=reference_answer
+                    )
+                except Exception as e:
+                    results[i] = e
+        
+        async def judge_group(style_value: str, indices: list[int]):
+            async with semaphore:
+                try:
+                    scores = await self._judge_marshaled(
+                        style_value, [items[i] for i in indices]
+                    )
+                except Exception as e:
+                    for i in indices:
+                        results[i] = e
+                    return
             
-            return QualityScore(
-                score=round(overall, 1),
-                feedback=feedback,
-                criteria_scores=criteria_scores
-            )
+            if scores is None:
+                # Unusable group reply: fall back to one call per row. Rows
+                # share this call's semaphore, so several failed groups still
+                # stay within max_concurrency
+                await asyncio.gather(*(judge_row(i) for i in indices))
+                return
             
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            # Fallback for parsing errors
+            for i, quality_score in zip(indices, scores):
+                results[i] = quality_score
+        
+        await asyncio.gather(*(
+            judge_group(style_value, indices[start:start + batch_size])
+            for style_value, indices in by_style.items()
+            for start in range(0, len(indices), batch_size)
+        ))
+        return results
+    
+    async def _judge_marshaled(
+        self,
+        style_value: str,
+        rows: list[tuple[str, str, ExpectedStyle, Optional[str]]]
+    ) -> Optional[list[QualityScore]]:
+        """Judge rows sharing a style in one call; None if the reply is unusable."""
+        start = time.perf_counter()
+        items_text = "\n".join(
+            f"# Item {n}\n" + EVALUATION_PROMPT.format(
+                prompt=prompt,
+                response=response,
+                reference_section=_reference_section(reference_answer)
+            )
+            for n, (prompt, response, _, reference_answer) in enumerate(rows, 1)
+        )
+        
+        eval_text = await _stream_json(
+            self.client,
+            self._limiter,
+            model=self.judge_model,
+            messages=[
+                _judge_system_message(style_value),
+                {
+                    "role": "user",
+                    "content": MARSHALED_EVALUATION_PROMPT.format(
+                        count=len(rows), items=items_text
+                    )
+                }
+            ],
+            temperature=JUDGE_TEMPERATURE,
+            max_tokens=500 * len(rows),
+            response_format=JSON_RESPONSE_FORMAT
+        )
+        _record_judge_metric(
+            self.judge_model, (time.perf_counter() - start) * 1000, cached=False
+        )
+        
+        try:
+            batch_output = JudgeBatchOutput.model_validate_json(eval_text)
+        except ValueError:
+            return None
+        if len(batch_output.results) != len(rows):
+            return None
+        
+        scores = [self._to_quality_score(output) for output in batch_output.results]
+        if self.cache is not None:
+            for (prompt, response, _, reference_answer), quality_score in zip(rows, scores):
+                await self._cache_set(
+                    self._cache_key(
+                        self.judge_model, prompt, response, style_value, reference_answer
+                    ),
+                    quality_score.model_dump()
+                )
+        return scores
+    
+    def _parse_evaluation(self, eval_text: str) -> QualityScore:
+        """Parse LLM evaluation output into QualityScore."""
+        try:
+            # JSON mode guarantees a bare JSON object; the schema guarantees
+            # every criterion is present and in range
+            judge_output = JudgeOutput.model_validate_json(eval_text)
+        except ValueError as e:
+            # Fallback for parsing errors (ValidationError is a ValueError)
             return QualityScore(
                 score=5.0,
                 feedback=f"Evaluation parsing error: {str(e)}. Raw: {eval_text[:200]}",
                 criteria_scores={}
             )
+        return self._to_quality_score(judge_output)
+    
+    def _to_quality_score(self, judge_output: JudgeOutput) -> QualityScore:
+        """Convert a validated judge verdict into a QualityScore."""
+        # Extract criteria scores and their weighted average in one pass
+        criteria_scores = {}
+        weighted_sum = 0.0
+        for key, weight in zip(CRITERIA_KEYS, CRITERIA_WEIGHTS):
+            value = getattr(judge_output, key)
+            criteria_scores[key] = value
+            weighted_sum += value * weight
+        
+        # Prefer the judge's overall score when provided
+        if judge_output.overall_score is not None:
+            overall = judge_output.overall_score
+        else:
+            overall = weighted_sum
+        
+        return QualityScore.model_construct(
+            score=round(overall, 1),
+            feedback=judge_output.feedback,
+            criteria_scores=criteria_scores
+        )
     
     async def compare_responses(
         self,
         prompt: str,
         response_a: str,
         response_b: str,
-        expected_style: ExpectedStyle = ExpectedStyle.EDUCATIONAL
+        expected_style: ExpectedStyle = ExpectedStyle.EDUCATIONAL,
+        mode: str = "parallel"
     ) -> dict:
         """
         Compare two responses and determine which is better.
         
         Useful for A/B testing different models or configurations.
+        
+        Args:
+            mode: "parallel" scores each response with its own concurrent
+                judge call and picks the higher score (fast, short outputs).
+                "single_call" shows both responses to the judge in one
+                prompt, for explicit comparative reasoning.
         """
+        if mode == "parallel":
+            quality_a, quality_b = await asyncio.gather(
+                self.evaluate(prompt, response_a, expected_style),
+                self.evaluate(prompt, response_b, expected_style)
+            )
+            if quality_a.score > quality_b.score:
+                winner = "A"
+            elif quality_b.score > quality_a.score:
+                winner = "B"
+            else:
+                winner = "tie"
+            return {
+                "winner": winner,
+                "a_score": quality_a.score,
+                "b_score": quality_b.score,
+                "reasoning": f"A: {quality_a.feedback} B: {quality_b.feedback}"
+            }
+        
+        style_value = getattr(expected_style, 'value', expected_style)
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(
+                kind="compare",
+                model=self.judge_model,
+                temperature=JUDGE_TEMPERATURE,
+                prompt=prompt,
+                response_a=response_a,
+                response_b=response_b,
+                style=style_value
+            )
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
         compare_prompt = f"""You are comparing two AI responses to the same prompt.
 
 ## Prompt
 {prompt}
 
 ## Expected Style
-{expected_style.value if hasattr(expected_style, 'value') else expected_style}
+{style_value}
 
 ## Response A
 {response_a}
@@ -241,25 +809,29 @@ Respond with JSON:
 }}
 """
         
-        judge_response = await self.client.chat.complete_async(
+        judge_response = await _complete(
+            self.client,
+            self._limiter,
             model=self.judge_model,
             messages=[
                 {"role": "user", "content": compare_prompt}
             ],
-            temperature=0.1,
-            max_tokens=300
+            temperature=JUDGE_TEMPERATURE,
+            max_tokens=300,
+            response_format=JSON_RESPONSE_FORMAT
         )
         
+        # Network errors propagate (429s are already retried in _complete);
+        # only a malformed reply degrades to a tie
         try:
-            json_match = re.search(
-                r'\{[^{}]*\}', 
-                judge_response.choices[0].message.content, 
-                re.DOTALL
-            )
-            if json_match:
-                return json.loads(json_match.group())
-        except:
-            pass
+            result = orjson.loads(judge_response.choices[0].message.content)
+        except (orjson.JSONDecodeError, AttributeError, TypeError, ValueError):
+            result = None
+        
+        if isinstance(result, dict):
+            if cache_key is not None:
+                await self._cache_set(cache_key, result)
+            return result
         
         return {
             "winner": "tie",
@@ -269,12 +841,45 @@ Respond with JSON:
         }
 
 
+@dataclass(frozen=True)
+class _CompiledRubric:
+    """A rubric with its judge prompt pre-rendered at import time."""
+    criteria: tuple[str, ...]
+    weights: tuple[float, ...]
+    prompt_template: str  # Only {prompt} and {response} left to fill
+
+
+def _compile_rubric(rubric: dict) -> _CompiledRubric:
+    """Render everything about a rubric's prompt except the per-call inputs."""
+    criteria = tuple(rubric["criteria"])
+    score_fields = ", ".join(f'"{c}": <score>' for c in criteria)
+    prompt_template = f"""Evaluate this response using these specific criteria: {", ".join(criteria)}
+
+Prompt: {{prompt}}
+Response: {{response}}
+
+Score each criterion 0-10 and respond with JSON:
+{{{{
+    {score_fields},
+    "feedback": "<brief feedback>"
+}}}}
+"""
+    return _CompiledRubric(
+        criteria=criteria,
+        weights=tuple(rubric["weights"]),
+        prompt_template=prompt_template
+    )
+
+
 class RubricEvaluator:
     """
     Alternative evaluator using predefined rubrics.
     
     More deterministic than LLM-as-judge but less flexible.
     Good for specific, well-defined evaluation criteria.
+    
+    Always judges with mistral-small-latest: narrow rubric criteria are
+    easy judgments, so the cheaper, faster model is good enough here.
     """
     
     # Predefined rubrics for common evaluation scenarios
@@ -297,9 +902,17 @@ class RubricEvaluator:
         }
     }
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = True,
+        rpm: int = 500
+    ):
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        self.client = Mistral(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
+        self.cache = (cache or get_default_cache()) if use_cache else None
+        self._limiter = _get_limiter(self.api_key, rpm)
     
     async def evaluate_with_rubric(
         self,
@@ -311,53 +924,53 @@ class RubricEvaluator:
         if rubric_type not in self.RUBRICS:
             rubric_type = "factual_qa"
         
-        rubric = self.RUBRICS[rubric_type]
-        criteria_list = ", ".join(rubric["criteria"])
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(
+                kind="rubric",
+                model="mistral-small-latest",
+                temperature=JUDGE_TEMPERATURE,
+                prompt=prompt,
+                response=response,
+                rubric=rubric_type
+            )
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return QualityScore(**cached)
         
-        eval_prompt = f"""Evaluate this response using these specific criteria: {criteria_list}
-
-Prompt: {prompt}
-Response: {response}
-
-Score each criterion 0-10 and respond with JSON:
-{{
-    {', '.join(f'"{c}": <score>' for c in rubric["criteria"])},
-    "feedback": "<brief feedback>"
-}}
-"""
+        rubric = _RUBRIC_CACHE[rubric_type]
+        eval_prompt = rubric.prompt_template.format(prompt=prompt, response=response)
         
-        judge_response = await self.client.chat.complete_async(
+        judge_response = await _complete(
+            self.client,
+            self._limiter,
             model="mistral-small-latest",  # Smaller model for rubric eval
             messages=[{"role": "user", "content": eval_prompt}],
-            temperature=0.1,
-            max_tokens=200
+            temperature=JUDGE_TEMPERATURE,
+            max_tokens=200,
+            response_format=JSON_RESPONSE_FORMAT
         )
         
+        # Only parsing problems fall back; network errors propagate
         try:
-            json_match = re.search(
-                r'\{[^{}]*\}',
-                judge_response.choices[0].message.content,
-                re.DOTALL
+            data = orjson.loads(judge_response.choices[0].message.content)
+            
+            criteria_scores = {}
+            overall = 0.0
+            for c, w in zip(rubric.criteria, rubric.weights):
+                value = float(data.get(c, 5))
+                criteria_scores[c] = value
+                overall += value * w
+            
+            quality_score = QualityScore(
+                score=round(overall, 1),
+                feedback=data.get("feedback", ""),
+                criteria_scores=criteria_scores
             )
-            if json_match:
-                data = json.loads(json_match.group())
-                
-                criteria_scores = {
-                    c: float(data.get(c, 5)) 
-                    for c in rubric["criteria"]
-                }
-                
-                overall = sum(
-                    criteria_scores[c] * w 
-                    for c, w in zip(rubric["criteria"], rubric["weights"])
-                )
-                
-                return QualityScore(
-                    score=round(overall, 1),
-                    feedback=data.get("feedback", ""),
-                    criteria_scores=criteria_scores
-                )
-        except:
+            if cache_key is not None:
+                await self._cache_set(cache_key, quality_score.model_dump())
+            return quality_score
+        except (orjson.JSONDecodeError, AttributeError, TypeError, ValueError):
             pass
         
         return QualityScore(
@@ -365,3 +978,10 @@ Score each criterion 0-10 and respond with JSON:
             feedback="Rubric evaluation failed",
             criteria_scores={}
         )
+
+
+# Rubric prompts rendered once at import
+_RUBRIC_CACHE: dict[str, _CompiledRubric] = {
+    name: _compile_rubric(rubric)
+    for name, rubric in RubricEvaluator.RUBRICS.items()
+}
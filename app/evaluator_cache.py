@@ -0,0 +1,161 @@
+"""
+Response cache for LLM-as-judge calls.
+
+Judge calls run at low temperature, so re-evaluating the same
+(model, prompt, response, style) payload gives the same verdict. Caching
+it skips the network round-trip and the token cost on re-runs.
+
+Backends:
+- InMemoryLLMCache: LRU with TTL, process-local (default)
+- FileLLMCache: one JSON file per key, survives restarts
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Protocol
+
+import orjson
+
+
+# Default time-to-live for cached judge outputs
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class LLMCache(Protocol):
+    """Minimal interface every cache backend implements."""
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached value, or None on miss/expiry."""
+        ...
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        """Store a value under key for ttl seconds."""
+        ...
+
+
+def make_cache_key(**payload) -> str:
+    """Build a content-addressable key from a JSON-serializable payload."""
+    raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(raw).hexdigest()
+
+
+class InMemoryLLMCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Entries are evicted least-recently-used first once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = DEFAULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Entry count and hit rate, for health/monitoring endpoints."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None
+        }
+
+
+class FileLLMCache:
+    """
+    Persistent cache storing one JSON file per key.
+
+    Useful when iterating on an eval pipeline across process restarts.
+    """
+
+    def __init__(self, directory: str | Path, ttl: float = DEFAULT_TTL_SECONDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if entry.get("expires_at", 0) < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps({"expires_at": expires_at, "value": value}))
+        # Atomic rename so readers never see a half-written entry
+        os.replace(tmp_path, path)
+
+
+# Process-wide default shared by all evaluators
+_default_cache: Optional[LLMCache] = None
+
+
+def get_default_cache() -> LLMCache:
+    """
+    Return the shared cache backend.
+
+    Uses a FileLLMCache when JUDGE_CACHE_DIR is set, in-memory LRU otherwise.
+    Size and TTL come from JUDGE_CACHE_SIZE / JUDGE_CACHE_TTL.
+    """
+    global _default_cache
+    if _default_cache is None:
+        ttl = float(os.getenv("JUDGE_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        cache_dir = os.getenv("JUDGE_CACHE_DIR")
+        if cache_dir:
+            _default_cache = FileLLMCache(cache_dir, ttl=ttl)
+        else:
+            maxsize = int(os.getenv("JUDGE_CACHE_SIZE", "10000"))
+            _default_cache = InMemoryLLMCache(maxsize=maxsize, ttl=ttl)
+    return _default_cache
+
+
+def set_default_cache(cache: LLMCache) -> None:
+    """Replace the shared cache backend (e.g. with a Redis-backed one)."""
+    global _default_cache
+    _default_cache = cache
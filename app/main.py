@@ -15,16 +15,20 @@ Repository: github.com/malekgatoufi/mistralmeter
 """
 
 import os
-import json
+import hmac
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Optional, Union
+from typing import Final, Optional, Union
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Security, Depends
+import orjson
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Security, Depends, Request
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.openapi.utils import get_openapi
+from pydantic import BaseModel, TypeAdapter
 from dotenv import load_dotenv
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -46,16 +50,27 @@ from app.schemas import (
     HumanRating
 )
 from app.runner import MistralRunner
-from app.evaluator import LLMEvaluator
-from app.metrics import aggregate_metrics, compare_metrics, compute_variance_metrics
+from app.evaluator import LLMEvaluator, close_clients
+from app.evaluator_cache import get_default_cache
+from app.ratings import RatingsBackend, create_ratings_backend
+from app.metrics import aggregate_metrics, compare_metrics, VarianceAggregator
 
 # Load environment variables
 load_dotenv()
 
 # ============ Security Configuration ============
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter. Counters live in process memory by default; point
+# RATE_LIMIT_STORAGE_URI at Redis (redis://host:6379/0, needs the optional
+# redis package) so limits hold across uvicorn workers and restarts.
+# moving-window counts requests over the trailing minute rather than in
+# fixed windows, so a client can't send twice the limit around a window
+# reset.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+    strategy="moving-window"
+)
 
 # API Key security
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -67,8 +82,14 @@ ALLOWED_API_KEYS = set(
     if key.strip()
 )
 
+# Digests of the allowed keys, compared in constant time
+_HASHED_KEYS: Final = tuple(
+    hashlib.blake2b(key.encode(), digest_size=32).digest()
+    for key in ALLOWED_API_KEYS
+)
+
 # Enable/disable authentication
-AUTH_ENABLED = os.getenv("ENABLE_AUTH", "false").lower() == "true"
+AUTH_ENABLED: Final = os.getenv("ENABLE_AUTH", "false").lower() == "true"
 
 
 async def verify_api_key(api_key: str = Security(API_KEY_HEADER)):
@@ -82,7 +103,13 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)):
             detail="Missing API key. Include 'X-API-Key' header."
         )
     
-    if api_key not in ALLOWED_API_KEYS:
+    digest = hashlib.blake2b(api_key.encode(), digest_size=32).digest()
+    # Check every key (no short-circuit) so timing doesn't reveal a match
+    valid = False
+    for hashed_key in _HASHED_KEYS:
+        valid |= hmac.compare_digest(digest, hashed_key)
+    
+    if not valid:
         raise HTTPException(
             status_code=403,
             detail="Invalid API key"
@@ -91,20 +118,44 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)):
     return True
 
 
+# Max concurrent generate+judge pipelines for multi-run evaluation
+EVAL_MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "8"))
+
+# Max concurrent judge calls when scoring a batch
+JUDGE_CONCURRENCY = int(os.getenv("JUDGE_CONCURRENCY", "8"))
+
+
 # Global instances (initialized on startup)
 runner: Optional[MistralRunner] = None
 evaluator: Optional[LLMEvaluator] = None
+ratings_store: Optional[RatingsBackend] = None
+
+# One evaluator per judge model, reused across requests so the rate
+# limiter and connection pool are shared
+_evaluator_pool: dict[str, LLMEvaluator] = {}
+
+
+def get_evaluator(judge_model: str) -> LLMEvaluator:
+    """Return the pooled evaluator for a judge model."""
+    eval_instance = _evaluator_pool.get(judge_model)
+    if eval_instance is None:
+        eval_instance = LLMEvaluator(api_key=evaluator.api_key, judge_model=judge_model)
+        _evaluator_pool[judge_model] = eval_instance
+    return eval_instance
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize resources on startup."""
-    global runner, evaluator
+    global runner, evaluator, ratings_store
+    
+    ratings_store = create_ratings_backend()
     
     api_key = os.getenv("MISTRAL_API_KEY")
     if api_key:
         runner = MistralRunner(api_key=api_key)
         evaluator = LLMEvaluator(api_key=api_key)
+        _evaluator_pool[evaluator.judge_model] = evaluator
         print("⚡ MistralMeter initialized successfully")
     else:
         print("⚠️ MISTRAL_API_KEY not set - API will not work")
@@ -112,6 +163,12 @@ async def lifespan(app: FastAPI):
     yield
     
     print("👋 MistralMeter shutting down...")
+    if runner:
+        await runner.aclose()
+    _evaluator_pool.clear()
+    await close_clients()
+    if hasattr(ratings_store, "aclose"):
+        await ratings_store.aclose()
 
 
 # Initialize FastAPI app
@@ -168,6 +225,7 @@ response = requests.post("http://localhost:8000/evaluate", json={
     """,
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Large batch payloads serialize in C
     contact={
         "name": "Malek Gatoufi",
         "email": "malek.gatoufi@example.com"
@@ -192,27 +250,68 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS middleware - restrictive by default
-ALLOWED_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+# Stripped so "a.com, b.com" matches exactly; the frozenset makes the
+# per-request origin check O(1)
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
+    allow_origins=frozenset(ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["Content-Type", "X-API-Key"],
 )
 
 
+# ============ Response Helpers ============
+
+def _make_etag(body: bytes) -> str:
+    """Weak ETag from a content hash."""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_response(
+    request: Request,
+    body: bytes,
+    etag: Optional[str] = None,
+    cache_control: str = "public, max-age=60"
+) -> Response:
+    """
+    Return body as JSON, or an empty 304 if the client already has it.
+    
+    Pollers that send back If-None-Match skip the response body entirely.
+    """
+    etag = etag or _make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model in pydantic-core directly.
+    
+    Returning a Response skips FastAPI's re-validation of the output
+    against response_model, which dominates large batch responses.
+    """
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
 # ============ Health Check ============
 
 @app.get("/", tags=["Health"], summary="Root health check")
-async def root():
+async def root(request: Request):
     """
     Quick health check endpoint.
     
     Returns service status, version, and available features.
     """
-    return {
+    return _etag_response(request, orjson.dumps({
         "status": "healthy",
         "service": "⚡ MistralMeter",
         "version": "2.0.0",
@@ -223,31 +322,45 @@ async def root():
             "human_in_the_loop",
             "model_comparison"
         ]
-    }
+    }), cache_control="no-cache")
 
 
 @app.get("/health", tags=["Health"])
-async def health_check():
+async def health_check(request: Request):
     """Detailed health check."""
-    return {
+    # no-cache: monitors always revalidate, but unchanged status costs no body
+    return _etag_response(request, orjson.dumps({
         "status": "healthy",
         "components": {
             "runner": "ready" if runner else "not configured",
             "evaluator": "ready" if evaluator else "not configured"
         },
+        "judge_cache": _judge_cache_stats(),
         "security": {
             "auth_enabled": AUTH_ENABLED,
             "rate_limiting": "active",
             "cors_origins": ALLOWED_ORIGINS
         }
-    }
+    }), cache_control="no-cache")
+
+
+def _judge_cache_stats() -> dict:
+    """Stats of the judge verdict cache shared by /evaluate, /evaluate/batch and /compare."""
+    cache = get_default_cache()
+    if hasattr(cache, "stats"):
+        return cache.stats()
+    return {"backend": type(cache).__name__}
 
 
 # ============ Evaluation Endpoints ============
 
 @app.post("/evaluate", response_model=Union[EvalResult, EvalResultWithVariance], tags=["Evaluation"])
 @limiter.limit("10/minute")
-async def evaluate_prompt(request: EvalRequest, authenticated: bool = Depends(verify_api_key)):
+async def evaluate_prompt(
+    request: Request,
+    eval_request: EvalRequest,
+    authenticated: bool = Depends(verify_api_key)
+):
     """
     Evaluate a single prompt with optional multi-run variance analysis.
     
@@ -283,103 +396,100 @@ async def evaluate_prompt(request: EvalRequest, authenticated: bool = Depends(ve
         )
     
     # Determine judge model (default to mistral-large for quality)
-    judge_model = request.judge_model or MistralModel.MISTRAL_LARGE
+    judge_model = eval_request.judge_model or MistralModel.MISTRAL_LARGE
     
     try:
-        if request.runs == 1:
+        if eval_request.runs == 1:
             # Single run - return simple result
             response_text, collector = await runner.run_prompt(
-                prompt=request.prompt,
-                model=request.model,
-                temperature=request.temperature,
-                max_tokens=request.max_tokens,
+                prompt=eval_request.prompt,
+                model=eval_request.model,
+                temperature=eval_request.temperature,
+                max_tokens=eval_request.max_tokens,
                 use_streaming=True  # Enable TTFT measurement
             )
             
-            # Update evaluator judge model if different
-            eval_instance = LLMEvaluator(
-                api_key=evaluator.api_key,
-                judge_model=judge_model.value
-            )
+            eval_instance = get_evaluator(judge_model.value)
             
             quality_score = await eval_instance.evaluate(
-                prompt=request.prompt.prompt,
+                prompt=eval_request.prompt.prompt,
                 response=response_text,
-                expected_style=request.prompt.expected_style,
-                reference_answer=request.prompt.reference_answer
+                expected_style=eval_request.prompt.expected_style,
+                reference_answer=eval_request.prompt.reference_answer
             )
             collector.set_quality(quality_score)
             
-            return EvalResult(
-                prompt=request.prompt.prompt,
-                model=request.model.value,
+            return _model_response(EvalResult.model_construct(
+                prompt=eval_request.prompt.prompt,
+                model=eval_request.model.value,
                 judge_model=judge_model.value,
                 response=response_text,
                 metrics=collector.to_eval_metrics()
-            )
+            ))
         
         else:
             # Multi-run - return variance analysis
-            responses = []
-            collectors = []
-            quality_scores = []
+            eval_instance = get_evaluator(judge_model.value)
             
-            eval_instance = LLMEvaluator(
-                api_key=evaluator.api_key,
-                judge_model=judge_model.value
-            )
+            # Runs are independent, so overlap their network round-trips
+            semaphore = asyncio.Semaphore(EVAL_MAX_CONCURRENCY)
+            # Each run is folded in as it finishes (completion order), so
+            # no collector is held until the last run returns
+            aggregator = VarianceAggregator()
+            responses: list[str] = []
+            scores: list[float] = []
             
-            for _ in range(request.runs):
-                response_text, collector = await runner.run_prompt(
-                    prompt=request.prompt,
-                    model=request.model,
-                    temperature=request.temperature,
-                    max_tokens=request.max_tokens,
-                    use_streaming=True  # Enable TTFT measurement
-                )
-                
-                quality_score = await eval_instance.evaluate(
-                    prompt=request.prompt.prompt,
-                    response=response_text,
-                    expected_style=request.prompt.expected_style,
-                    reference_answer=request.prompt.reference_answer
-                )
-                
-                responses.append(response_text)
-                collectors.append(collector)
-                quality_scores.append(quality_score)
+            async def single_run():
+                async with semaphore:
+                    response_text, collector = await runner.run_prompt(
+                        prompt=eval_request.prompt,
+                        model=eval_request.model,
+                        temperature=eval_request.temperature,
+                        max_tokens=eval_request.max_tokens,
+                        use_streaming=True,  # Enable TTFT measurement
+                        deterministic=False  # Variance needs sampling noise
+                    )
+                    
+                    quality_score = await eval_instance.evaluate(
+                        prompt=eval_request.prompt.prompt,
+                        response=response_text,
+                        expected_style=eval_request.prompt.expected_style,
+                        reference_answer=eval_request.prompt.reference_answer
+                    )
+                    aggregator.add(collector, quality_score)
+                    responses.append(response_text)
+                    scores.append(quality_score.score)
             
-            # Find best response
-            best_idx = max(range(len(quality_scores)), key=lambda i: quality_scores[i].score)
+            await asyncio.gather(*[single_run() for _ in range(eval_request.runs)])
+            
+            # Find best response (first run with the top score)
+            best_idx = scores.index(max(scores))
             
             # Compute variance metrics
-            variance_metrics = compute_variance_metrics(collectors, quality_scores)
+            variance_metrics = aggregator.finalize()
             
-            return EvalResultWithVariance(
-                prompt=request.prompt.prompt,
-                model=request.model.value,
+            return _model_response(EvalResultWithVariance.model_construct(
+                prompt=eval_request.prompt.prompt,
+                model=eval_request.model.value,
                 judge_model=judge_model.value,
                 responses=responses,
                 best_response=responses[best_idx],
                 metrics=variance_metrics
-            )
+            ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/evaluate/batch", response_model=BatchEvalResult, tags=["Evaluation"])
-@limiter.limit("5/minute")
-async def evaluate_batch(request: BatchEvalRequest, authenticated: bool = Depends(verify_api_key)):
-    """
-    Evaluate multiple prompts in batch.
-    
-    Executes all prompts with controlled concurrency and returns:
-    - Individual results for each prompt
-    - Aggregated summary statistics
-    
-    Great for running evaluation datasets.
-    """
+async def _run_batch(
+    prompts: list[EvalPrompt],
+    model: MistralModel,
+    temperature: float,
+    max_tokens: int,
+    judge_model: Optional[MistralModel] = None,
+    marshal_size: int = 1
+) -> BatchEvalResult:
+    """Generate and judge a list of prompts (shared by batch and dataset endpoints)."""
     if not runner or not evaluator:
         raise HTTPException(
             status_code=503,
@@ -388,51 +498,178 @@ async def evaluate_batch(request: BatchEvalRequest, authenticated: bool = Depend
     
     try:
         # Run all prompts
-        results_data = await runner.run_batch(
-            prompts=request.prompts,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
+        results_data = await runner.run_batch_list(
+            prompts=prompts,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens
         )
         
-        # Determine judge model
-        judge_model = getattr(request, 'judge_model', None) or MistralModel.MISTRAL_LARGE
-        eval_instance = LLMEvaluator(
-            api_key=evaluator.api_key,
-            judge_model=judge_model.value
-        )
+        judge_model = judge_model or MistralModel.MISTRAL_LARGE
+        eval_instance = get_evaluator(judge_model.value)
         
-        # Evaluate each response
-        results = []
-        for prompt, (response_text, collector) in zip(request.prompts, results_data):
-            quality_score = await eval_instance.evaluate(
-                prompt=prompt.prompt,
-                response=response_text,
-                expected_style=prompt.expected_style,
-                reference_answer=prompt.reference_answer
+        # Failed generations are reported as errors rather than judged
+        generated = []
+        errors = []
+        for prompt, (response_text, collector, error) in zip(prompts, results_data):
+            if error is not None:
+                errors.append({"prompt": prompt.prompt, "error": str(error)})
+            else:
+                generated.append((prompt, response_text, collector))
+        
+        # Judge all responses concurrently, optionally several rows per call
+        judge_items = [
+            (prompt.prompt, response_text, prompt.expected_style, prompt.reference_answer)
+            for prompt, response_text, _ in generated
+        ]
+        if marshal_size > 1:
+            quality_scores = await eval_instance.evaluate_marshaled(
+                judge_items,
+                batch_size=marshal_size,
+                max_concurrency=JUDGE_CONCURRENCY
+            )
+        else:
+            quality_scores = await eval_instance.evaluate_many(
+                judge_items,
+                max_concurrency=JUDGE_CONCURRENCY
             )
+        
+        # Build results (no network in this loop)
+        results = []
+        for (prompt, response_text, collector), quality_score in zip(
+            generated, quality_scores
+        ):
+            if isinstance(quality_score, BaseException):
+                raise quality_score
             collector.set_quality(quality_score)
             
-            results.append(EvalResult(
+            results.append(EvalResult.model_construct(
                 prompt=prompt.prompt,
-                model=request.model.value,
+                model=model.value,
                 judge_model=judge_model.value,
                 response=response_text,
                 metrics=collector.to_eval_metrics()
             ))
         
         # Aggregate metrics
-        summary = aggregate_metrics([r.metrics for r in results])
+        summary = aggregate_metrics([r.metrics for r in results], model.value)
         
-        return BatchEvalResult(results=results, summary=summary)
+        return BatchEvalResult.model_construct(
+            results=results, summary=summary, errors=errors
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/evaluate/batch", response_model=BatchEvalResult, tags=["Evaluation"])
+@limiter.limit("5/minute")
+async def evaluate_batch(
+    request: Request,
+    batch_request: BatchEvalRequest,
+    authenticated: bool = Depends(verify_api_key)
+):
+    """
+    Evaluate multiple prompts in batch.
+    
+    Executes all prompts with controlled concurrency and returns:
+    - Individual results for each prompt
+    - Aggregated summary statistics
+    
+    Great for running evaluation datasets.
+    """
+    return _model_response(await _run_batch(
+        prompts=batch_request.prompts,
+        model=batch_request.model,
+        temperature=batch_request.temperature,
+        max_tokens=batch_request.max_tokens,
+        judge_model=batch_request.judge_model,
+        marshal_size=batch_request.marshal_size
+    ))
+
+
+@app.post("/evaluate/batch/stream", tags=["Evaluation"])
+@limiter.limit("5/minute")
+async def evaluate_batch_stream(
+    request: Request,
+    batch_request: BatchEvalRequest,
+    authenticated: bool = Depends(verify_api_key)
+):
+    """
+    Evaluate multiple prompts, streaming results as NDJSON.
+    
+    Emits one EvalResult per line as soon as each prompt is generated
+    and judged (completion order, not input order), then a final
+    `{"summary": {...}}` line. Failed prompts produce
+    `{"prompt": ..., "error": ...}` lines instead of aborting the batch.
+    """
+    if not runner or not evaluator:
+        raise HTTPException(
+            status_code=503,
+            detail="Service not configured. Set MISTRAL_API_KEY."
+        )
+    
+    judge_model = batch_request.judge_model or MistralModel.MISTRAL_LARGE
+    eval_instance = get_evaluator(judge_model.value)
+    semaphore = asyncio.Semaphore(EVAL_MAX_CONCURRENCY)
+    
+    async def pipeline(prompt: EvalPrompt) -> tuple[EvalPrompt, Union[EvalResult, Exception]]:
+        """Generate and judge one prompt, returning the error instead of raising."""
+        try:
+            async with semaphore:
+                response_text, collector = await runner.run_prompt(
+                    prompt=prompt,
+                    model=batch_request.model,
+                    temperature=batch_request.temperature,
+                    max_tokens=batch_request.max_tokens
+                )
+                quality_score = await eval_instance.evaluate(
+                    prompt=prompt.prompt,
+                    response=response_text,
+                    expected_style=prompt.expected_style,
+                    reference_answer=prompt.reference_answer
+                )
+        except Exception as e:
+            return prompt, e
+        collector.set_quality(quality_score)
+        
+        return prompt, EvalResult.model_construct(
+            prompt=prompt.prompt,
+            model=batch_request.model.value,
+            judge_model=judge_model.value,
+            response=response_text,
+            metrics=collector.to_eval_metrics()
+        )
+    
+    async def generate():
+        tasks = [asyncio.create_task(pipeline(p)) for p in batch_request.prompts]
+        metrics = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                prompt, result = await next_result
+                if isinstance(result, Exception):
+                    yield orjson.dumps({"prompt": prompt.prompt, "error": str(result)}) + b"\n"
+                    continue
+                metrics.append(result.metrics)
+                yield orjson.dumps(result.model_dump(mode="json")) + b"\n"
+            
+            summary = aggregate_metrics(metrics, batch_request.model.value) if metrics else {}
+            yield orjson.dumps({"summary": summary}) + b"\n"
+        finally:
+            # Client disconnected early: stop the remaining pipelines
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @app.post("/compare", response_model=CompareResult, tags=["Comparison"])
 @limiter.limit("8/minute")
-async def compare_models(request: CompareRequest, authenticated: bool = Depends(verify_api_key)):
+async def compare_models(
+    request: Request,
+    compare_request: CompareRequest,
+    authenticated: bool = Depends(verify_api_key)
+):
     """
     Compare two models on the same prompt.
     
@@ -453,82 +690,68 @@ async def compare_models(request: CompareRequest, authenticated: bool = Depends(
         )
     
     # Use separate judge model
-    judge_model = request.judge_model or MistralModel.MISTRAL_LARGE
-    eval_instance = LLMEvaluator(
-        api_key=evaluator.api_key,
-        judge_model=judge_model.value
-    )
+    judge_model = compare_request.judge_model or MistralModel.MISTRAL_LARGE
+    eval_instance = get_evaluator(judge_model.value)
     
-    try:
-        # Run on both models
-        response_a, collector_a = await runner.run_prompt(
-            prompt=request.prompt,
-            model=request.model_a,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
-        )
-        
-        response_b, collector_b = await runner.run_prompt(
-            prompt=request.prompt,
-            model=request.model_b,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
+    async def pipeline(model: MistralModel):
+        """Generate with one model, then judge its response."""
+        response_text, collector = await runner.run_prompt(
+            prompt=compare_request.prompt,
+            model=model,
+            temperature=compare_request.temperature,
+            max_tokens=compare_request.max_tokens
         )
-        
-        # Evaluate both with separate judge
-        quality_a = await eval_instance.evaluate(
-            prompt=request.prompt.prompt,
-            response=response_a,
-            expected_style=request.prompt.expected_style
+        quality_score = await eval_instance.evaluate(
+            prompt=compare_request.prompt.prompt,
+            response=response_text,
+            expected_style=compare_request.prompt.expected_style
         )
-        collector_a.set_quality(quality_a)
-        
-        quality_b = await eval_instance.evaluate(
-            prompt=request.prompt.prompt,
-            response=response_b,
-            expected_style=request.prompt.expected_style
+        collector.set_quality(quality_score)
+        return response_text, collector
+    
+    try:
+        # Both models run (and get judged) concurrently with separate judge
+        (response_a, collector_a), (response_b, collector_b) = await asyncio.gather(
+            pipeline(compare_request.model_a),
+            pipeline(compare_request.model_b)
         )
-        collector_b.set_quality(quality_b)
         
         # Build results
-        result_a = EvalResult(
-            prompt=request.prompt.prompt,
-            model=request.model_a.value,
+        result_a = EvalResult.model_construct(
+            prompt=compare_request.prompt.prompt,
+            model=compare_request.model_a.value,
             judge_model=judge_model.value,
             response=response_a,
             metrics=collector_a.to_eval_metrics()
         )
         
-        result_b = EvalResult(
-            prompt=request.prompt.prompt,
-            model=request.model_b.value,
+        result_b = EvalResult.model_construct(
+            prompt=compare_request.prompt.prompt,
+            model=compare_request.model_b.value,
             judge_model=judge_model.value,
             response=response_b,
             metrics=collector_b.to_eval_metrics()
         )
         
         # Compare metrics
-        comparison = compare_metrics(
-            collector_a.to_eval_metrics(),
-            collector_b.to_eval_metrics()
-        )
+        comparison = compare_metrics(result_a.metrics, result_b.metrics)
         
         # Determine winner
-        winner = request.model_a.value if comparison["overall_winner"] == "a" else request.model_b.value
+        winner = compare_request.model_a.value if comparison.overall_winner == "a" else compare_request.model_b.value
         
         summary = (
-            f"{winner} wins with {comparison['confidence']}% confidence. "
-            f"Quality: {comparison['quality']['a_score']:.1f} vs {comparison['quality']['b_score']:.1f}. "
-            f"Latency: {comparison['latency']['a_ms']:.0f}ms vs {comparison['latency']['b_ms']:.0f}ms."
+            f"{winner} wins with {comparison.confidence}% confidence. "
+            f"Quality: {comparison.a_score:.1f} vs {comparison.b_score:.1f}. "
+            f"Latency: {comparison.a_latency_ms:.0f}ms vs {comparison.b_latency_ms:.0f}ms."
         )
         
-        return CompareResult(
-            prompt=request.prompt.prompt,
+        return _model_response(CompareResult.model_construct(
+            prompt=compare_request.prompt.prompt,
             model_a=result_a,
             model_b=result_b,
             winner=winner,
             comparison_summary=summary
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -536,10 +759,6 @@ async def compare_models(request: CompareRequest, authenticated: bool = Depends(
 
 # ============ Human-in-the-Loop Endpoints ============
 
-# In-memory storage for human ratings (use Redis/DB in production)
-human_ratings_store: dict[str, list[HumanRating]] = {}
-
-
 @app.post("/rate/{evaluation_id}", response_model=HumanRating, tags=["Human-in-the-Loop"])
 async def submit_human_rating(
     evaluation_id: str,
@@ -571,10 +790,7 @@ async def submit_human_rating(
         rater_id=rater_id
     )
     
-    # Store rating
-    if evaluation_id not in human_ratings_store:
-        human_ratings_store[evaluation_id] = []
-    human_ratings_store[evaluation_id].append(human_rating)
+    await ratings_store.append(evaluation_id, human_rating)
     
     return human_rating
 
@@ -587,7 +803,7 @@ async def get_human_ratings(evaluation_id: str):
     Returns list of ratings submitted by different raters.
     Useful for computing inter-rater reliability (Krippendorff's alpha).
     """
-    return human_ratings_store.get(evaluation_id, [])
+    return await ratings_store.list(evaluation_id)
 
 
 @app.get("/ratings/stats", tags=["Human-in-the-Loop"])
@@ -600,34 +816,18 @@ async def get_rating_statistics():
     - Average rating across all evaluations
     - Rating distribution
     """
-    all_ratings = []
-    for ratings in human_ratings_store.values():
-        all_ratings.extend([r.rating for r in ratings])
-    
-    if not all_ratings:
-        return {
-            "total_evaluations": 0,
-            "total_ratings": 0,
-            "average_rating": None,
-            "distribution": {}
-        }
-    
-    from collections import Counter
-    distribution = dict(Counter(all_ratings))
-    
-    return {
-        "total_evaluations": len(human_ratings_store),
-        "total_ratings": len(all_ratings),
-        "average_rating": sum(all_ratings) / len(all_ratings),
-        "distribution": {str(k): v for k, v in sorted(distribution.items())}
-    }
+    return await ratings_store.stats()
 
 
 # ============ Streaming Endpoint ============
 
 @app.post("/stream", tags=["Streaming"])
 @limiter.limit("15/minute")
-async def stream_response(request: EvalRequest, authenticated: bool = Depends(verify_api_key)):
+async def stream_response(
+    request: Request,
+    eval_request: EvalRequest,
+    authenticated: bool = Depends(verify_api_key)
+):
     """
     Stream response tokens in real-time.
     
@@ -642,13 +842,13 @@ async def stream_response(request: EvalRequest, authenticated: bool = Depends(ve
     
     async def generate():
         async for chunk in runner.stream_response(
-            prompt=request.prompt,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
+            prompt=eval_request.prompt,
+            model=eval_request.model,
+            temperature=eval_request.temperature,
+            max_tokens=eval_request.max_tokens
         ):
-            yield f"data: {json.dumps({'token': chunk})}\n\n"
-        yield "data: [DONE]\n\n"
+            yield b"data: " + orjson.dumps({"token": chunk}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
     
     return StreamingResponse(
         generate(),
@@ -660,33 +860,77 @@ async def stream_response(request: EvalRequest, authenticated: bool = Depends(ve
 
 DATASETS_DIR = Path(__file__).parent.parent / "datasets"
 
+# Validates a whole prompt list in one call into pydantic-core
+EVAL_PROMPT_LIST = TypeAdapter(list[EvalPrompt])
+
+# Parsed datasets keyed by path, invalidated when the file's mtime changes
+_dataset_cache: dict[Path, tuple[float, EvalDataset, DatasetInfo]] = {}
+
+
+def _scan_datasets() -> tuple[list[Path], bytes]:
+    """List dataset files and a fingerprint of their names and mtimes."""
+    files = sorted(DATASETS_DIR.glob("*.json")) if DATASETS_DIR.exists() else []
+    fingerprint = orjson.dumps([(f.name, f.stat().st_mtime_ns) for f in files])
+    return files, fingerprint
+
+
+def _load_dataset(path: Path) -> tuple[EvalDataset, DatasetInfo]:
+    """
+    Parse a dataset file, reusing the cached result while it is unchanged.
+    
+    Blocking; handlers call it through asyncio.to_thread.
+    """
+    mtime = path.stat().st_mtime
+    cached = _dataset_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    
+    data = orjson.loads(path.read_bytes())
+    if not isinstance(data, dict):
+        # Valid JSON but not a dataset (e.g. a bare list); callers treat
+        # ValueError as an unusable file
+        raise ValueError(f"{path.name}: expected a JSON object at the top level")
+    prompts = data.get("prompts", [])
+    dataset = EvalDataset(
+        name=path.stem,
+        description=data.get("description"),
+        prompts=EVAL_PROMPT_LIST.validate_python(prompts)
+    )
+    info = DatasetInfo(
+        name=path.stem,
+        description=data.get("description"),
+        prompt_count=len(prompts),
+        categories=list({p.get("category", "uncategorized") for p in prompts})
+    )
+    _dataset_cache[path] = (mtime, dataset, info)
+    return dataset, info
+
 
 @app.get("/datasets", response_model=list[DatasetInfo], tags=["Datasets"])
-async def list_datasets():
+async def list_datasets(request: Request):
     """List available evaluation datasets."""
-    datasets = []
+    files, fingerprint = await asyncio.to_thread(_scan_datasets)
     
-    if DATASETS_DIR.exists():
-        for file in DATASETS_DIR.glob("*.json"):
-            try:
-                with open(file) as f:
-                    data = json.load(f)
-                    prompts = data.get("prompts", [])
-                    categories = list(set(
-                        p.get("category", "uncategorized") 
-                        for p in prompts
-                    ))
-                    
-                    datasets.append(DatasetInfo(
-                        name=file.stem,
-                        description=data.get("description"),
-                        prompt_count=len(prompts),
-                        categories=categories
-                    ))
-            except:
-                pass
+    # Validator from file names + mtimes: editing a dataset invalidates it,
+    # and a matching client is answered without parsing anything
+    etag = _make_etag(fingerprint)
+    if request.headers.get("if-none-match") == etag:
+        return _etag_response(request, b"", etag)
     
-    return datasets
+    # Files load in parallel worker threads; unreadable or invalid ones are skipped
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(_load_dataset, file) for file in files),
+        return_exceptions=True
+    )
+    datasets = []
+    for result in loaded:
+        if isinstance(result, (OSError, ValueError)):
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        datasets.append(result[1].model_dump())
+    
+    return _etag_response(request, orjson.dumps(datasets), etag)
 
 
 @app.get("/datasets/{name}", response_model=EvalDataset, tags=["Datasets"])
@@ -698,20 +942,16 @@ async def get_dataset(name: str):
         raise HTTPException(status_code=404, detail=f"Dataset '{name}' not found")
     
     try:
-        with open(file_path) as f:
-            data = json.load(f)
-            return EvalDataset(
-                name=name,
-                description=data.get("description"),
-                prompts=[EvalPrompt(**p) for p in data.get("prompts", [])]
-            )
-    except Exception as e:
+        return (await asyncio.to_thread(_load_dataset, file_path))[0]
+    except (OSError, ValueError) as e:
+        # ValueError covers both malformed JSON and schema validation errors
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/datasets/{name}/evaluate", response_model=BatchEvalResult, tags=["Datasets"])
 @limiter.limit("3/minute")
 async def evaluate_dataset(
+    request: Request,
     name: str,
     model: MistralModel = MistralModel.MISTRAL_SMALL,
     temperature: float = 0.7,
@@ -723,64 +963,65 @@ async def evaluate_dataset(
     
     Runs all prompts in the dataset and returns aggregated results.
     """
-    # Get dataset
     dataset = await get_dataset(name)
     
-    # Create batch request
-    batch_request = BatchEvalRequest(
+    return _model_response(await _run_batch(
         prompts=dataset.prompts,
         model=model,
         temperature=temperature,
         max_tokens=max_tokens
-    )
-    
-    return await evaluate_batch(batch_request)
+    ))
 
 
 # ============ Utility Endpoints ============
 
+_MODEL_DESCRIPTIONS = {
+    MistralModel.MISTRAL_TINY: "Fastest, most cost-effective",
+    MistralModel.MISTRAL_SMALL: "Good balance of speed and quality",
+    MistralModel.MISTRAL_MEDIUM: "Higher quality, moderate cost",
+    MistralModel.MISTRAL_LARGE: "Highest quality, highest cost",
+    MistralModel.OPEN_MISTRAL_7B: "Open source 7B model",
+    MistralModel.OPEN_MIXTRAL_8X7B: "Open source MoE model",
+    MistralModel.OPEN_MIXTRAL_8X22B: "Large open source MoE model",
+    MistralModel.CODESTRAL: "Specialized for code generation"
+}
+
+# Static payloads, serialized once at import
+_MODELS_PAYLOAD = {
+    "models": [
+        {
+            "id": model.value,
+            "name": model.name,
+            "description": _MODEL_DESCRIPTIONS.get(model, "Mistral model")
+        }
+        for model in MistralModel
+    ]
+}
+_STYLES_PAYLOAD = {
+    "styles": [
+        {
+            "id": style.value,
+            "name": style.name
+        }
+        for style in ExpectedStyle
+    ]
+}
+_MODELS_BODY = orjson.dumps(_MODELS_PAYLOAD)
+_STYLES_BODY = orjson.dumps(_STYLES_PAYLOAD)
+_MODELS_ETAG = _make_etag(_MODELS_BODY)
+_STYLES_ETAG = _make_etag(_STYLES_BODY)
+
+
 @app.get("/models", tags=["Utilities"])
-async def list_models():
+async def list_models(request: Request):
     """List available Mistral models."""
-    return {
-        "models": [
-            {
-                "id": model.value,
-                "name": model.name,
-                "description": _get_model_description(model)
-            }
-            for model in MistralModel
-        ]
-    }
+    return _etag_response(request, _MODELS_BODY, _MODELS_ETAG)
 
 
 @app.get("/styles", tags=["Utilities"])
-async def list_styles():
+async def list_styles(request: Request):
     """List available response styles for evaluation."""
-    return {
-        "styles": [
-            {
-                "id": style.value,
-                "name": style.name
-            }
-            for style in ExpectedStyle
-        ]
-    }
-
-
-def _get_model_description(model: MistralModel) -> str:
-    """Get description for a model."""
-    descriptions = {
-        MistralModel.MISTRAL_TINY: "Fastest, most cost-effective",
-        MistralModel.MISTRAL_SMALL: "Good balance of speed and quality",
-        MistralModel.MISTRAL_MEDIUM: "Higher quality, moderate cost",
-        MistralModel.MISTRAL_LARGE: "Highest quality, highest cost",
-        MistralModel.OPEN_MISTRAL_7B: "Open source 7B model",
-        MistralModel.OPEN_MIXTRAL_8X7B: "Open source MoE model",
-        MistralModel.OPEN_MIXTRAL_8X22B: "Large open source MoE model",
-        MistralModel.CODESTRAL: "Specialized for code generation"
-    }
-    return descriptions.get(model, "Mistral model")
+    return _etag_response(request, _STYLES_BODY, _STYLES_ETAG)
 
 
 # ============ Run with uvicorn ============
@@ -789,7 +1030,10 @@ if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",  # Cheaper task scheduling for the concurrent judge fan-out
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=os.getenv("DEV") == "1"  # File watcher only in development
     )
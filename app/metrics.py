@@ -8,11 +8,12 @@ Handles:
 - Variance analysis for multiple runs (capturing LLM stochasticity)
 """
 
+import math
 import time
-import statistics
+import bisect
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Optional
-from contextlib import contextmanager
+from typing import NamedTuple, Optional
 
 from app.schemas import (
     TokenMetrics, 
@@ -21,11 +22,12 @@ from app.schemas import (
     QualityScore,
     QualityScoreWithVariance, 
     EvalMetrics,
-    EvalMetricsWithVariance
+    EvalMetricsWithVariance,
+    token_cost_usd
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricsCollector:
     """
     Collects and calculates metrics during LLM inference.
@@ -37,10 +39,14 @@ class MetricsCollector:
         collector.record_tokens(input_tokens=10, output_tokens=50)
     """
     
-    # Timing
-    _start_time: Optional[float] = field(default=None, repr=False)
-    _end_time: Optional[float] = field(default=None, repr=False)
-    _first_token_time: Optional[float] = field(default=None, repr=False)
+    # Timing (perf_counter_ns; integer nanoseconds avoid float rounding
+    # on sub-millisecond intervals)
+    _start_time: Optional[int] = field(default=None, repr=False)
+    _end_time: Optional[int] = field(default=None, repr=False)
+    _first_token_time: Optional[int] = field(default=None, repr=False)
+    # Derived durations, computed once when the timestamps are taken
+    _latency_ms: Optional[float] = field(default=None, repr=False)
+    _ttft_ms: Optional[float] = field(default=None, repr=False)
     
     # Token counts
     input_tokens: int = 0
@@ -49,19 +55,25 @@ class MetricsCollector:
     # Quality (set after evaluation)
     quality_score: Optional[QualityScore] = None
     
-    @contextmanager
-    def measure_latency(self):
+    def reset(self):
+        """Clear all recorded data."""
+        self._start_time = None
+        self._end_time = None
+        self._first_token_time = None
+        self._latency_ms = None
+        self._ttft_ms = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.quality_score = None
+    
+    def measure_latency(self) -> "_LatencyCtx":
         """Context manager for measuring total latency."""
-        self._start_time = time.perf_counter()
-        try:
-            yield self
-        finally:
-            self._end_time = time.perf_counter()
+        return _LatencyCtx(self)
     
     def mark_first_token(self):
         """Mark when first token is received (for streaming)."""
         if self._first_token_time is None:
-            self._first_token_time = time.perf_counter()
+            self._first_token_time = time.perf_counter_ns()
     
     def record_tokens(self, input_tokens: int, output_tokens: int):
         """Record token usage."""
@@ -75,26 +87,30 @@ class MetricsCollector:
     @property
     def total_latency_ms(self) -> float:
         """Total latency in milliseconds."""
+        if self._latency_ms is not None:
+            return self._latency_ms
         if self._start_time is None or self._end_time is None:
             return 0.0
-        return (self._end_time - self._start_time) * 1000
+        return (self._end_time - self._start_time) / 1_000_000
     
     @property
     def time_to_first_token_ms(self) -> Optional[float]:
         """Time to first token in milliseconds."""
+        if self._ttft_ms is not None:
+            return self._ttft_ms
         if self._start_time is None or self._first_token_time is None:
             return None
-        return (self._first_token_time - self._start_time) * 1000
+        return (self._first_token_time - self._start_time) / 1_000_000
     
     @property
     def tokens_per_second(self) -> Optional[float]:
         """Generation speed in tokens per second."""
-        if self._start_time is None or self._end_time is None:
-            return None
-        duration_s = self._end_time - self._start_time
-        if duration_s <= 0:
+        # Tokens are usually recorded after timing ends, so only the
+        # duration is cached
+        latency_ms = self.total_latency_ms
+        if latency_ms <= 0:
             return None
-        return self.output_tokens / duration_s
+        return self.output_tokens * 1000 / latency_ms
     
     @property
     def total_tokens(self) -> int:
@@ -103,69 +119,133 @@ class MetricsCollector:
     
     def to_eval_metrics(self) -> EvalMetrics:
         """Convert collected data to EvalMetrics schema."""
-        token_metrics = TokenMetrics(
-            input_tokens=self.input_tokens,
-            output_tokens=self.output_tokens,
-            total_tokens=self.total_tokens
+        input_tokens = self.input_tokens
+        output_tokens = self.output_tokens
+        token_metrics = TokenMetrics.model_construct(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens
         )
         
-        latency_metrics = LatencyMetrics(
+        ttft = self.time_to_first_token_ms
+        tps = self.tokens_per_second
+        latency_metrics = LatencyMetrics.model_construct(
             total_ms=round(self.total_latency_ms, 2),
-            time_to_first_token_ms=(
-                round(self.time_to_first_token_ms, 2) 
-                if self.time_to_first_token_ms else None
-            ),
-            tokens_per_second=(
-                round(self.tokens_per_second, 1)
-                if self.tokens_per_second else None
-            )
+            time_to_first_token_ms=round(ttft, 2) if ttft else None,
+            tokens_per_second=round(tps, 1) if tps else None
         )
         
         # Default quality if not evaluated
-        quality = self.quality_score or QualityScore(
+        quality = self.quality_score or QualityScore.model_construct(
             score=0.0,
             feedback="Not evaluated",
             criteria_scores={}
         )
         
-        return EvalMetrics(
+        return EvalMetrics.model_construct(
             tokens=token_metrics,
             latency=latency_metrics,
             quality=quality
         )
 
 
-def aggregate_metrics(metrics_list: list[EvalMetrics]) -> dict:
+class _LatencyCtx:
+    """
+    Times a block for a MetricsCollector.
+    
+    A plain class rather than @contextmanager: the generator machinery
+    costs more than the timing itself on cached (sub-millisecond) calls.
+    """
+    
+    __slots__ = ("collector",)
+    
+    def __init__(self, collector: MetricsCollector):
+        self.collector = collector
+    
+    def __enter__(self) -> MetricsCollector:
+        collector = self.collector
+        collector._latency_ms = None
+        collector._start_time = time.perf_counter_ns()
+        return collector
+    
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        collector = self.collector
+        start = collector._start_time
+        collector._end_time = end
+        collector._latency_ms = (end - start) / 1_000_000
+        if collector._first_token_time is not None:
+            collector._ttft_ms = (collector._first_token_time - start) / 1_000_000
+        return None
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    """
+    q-quantile of an already sorted list, with linear interpolation
+    between ranks (NumPy's default method).
+    """
+    position = (len(sorted_values) - 1) * q
+    lower_rank = int(position)
+    fraction = position - lower_rank
+    lower = sorted_values[lower_rank]
+    if fraction == 0:
+        return lower
+    return lower + (sorted_values[lower_rank + 1] - lower) * fraction
+
+
+def aggregate_metrics(metrics_list: list[EvalMetrics], model: Optional[str] = None) -> dict:
     """
     Aggregate metrics from multiple evaluations.
     
-    Returns summary statistics for batch evaluation.
+    Returns summary statistics for batch evaluation. The cost estimate
+    uses the pricing of model (mistral-small rates if unknown).
     """
     if not metrics_list:
         return {}
     
     n = len(metrics_list)
     
-    # Latency stats
-    latencies = [m.latency.total_ms for m in metrics_list]
-    avg_latency = sum(latencies) / n
-    min_latency = min(latencies)
-    max_latency = max(latencies)
+    if n == 1:
+        # Single result (e.g. interim summaries): every statistic is the value itself
+        m = metrics_list[0]
+        tokens = m.tokens
+        total_input = tokens.input_tokens
+        total_output = tokens.output_tokens
+        total_tokens = tokens.total_tokens
+        avg_latency = min_latency = max_latency = p50_latency = latency_sum = m.latency.total_ms
+        avg_quality = min_quality = max_quality = m.quality.score
+    else:
+        # One pass over the results instead of one per statistic
+        latencies = [0.0] * n
+        total_input = total_output = total_tokens = 0
+        quality_sum = 0.0
+        min_quality = max_quality = metrics_list[0].quality.score
+        for i, m in enumerate(metrics_list):
+            latencies[i] = m.latency.total_ms
+            tokens = m.tokens
+            total_input += tokens.input_tokens
+            total_output += tokens.output_tokens
+            total_tokens += tokens.total_tokens
+            score = m.quality.score
+            quality_sum += score
+            if score < min_quality:
+                min_quality = score
+            elif score > max_quality:
+                max_quality = score
+        
+        # One C sort serves min, max and every quantile
+        latencies.sort()
+        latency_sum = sum(latencies)
+        avg_latency = latency_sum / n
+        min_latency = latencies[0]
+        max_latency = latencies[-1]
+        p50_latency = _quantile(latencies, 0.5)
+        avg_quality = quality_sum / n
     
-    # Token stats
-    total_input = sum(m.tokens.input_tokens for m in metrics_list)
-    total_output = sum(m.tokens.output_tokens for m in metrics_list)
-    total_tokens = sum(m.tokens.total_tokens for m in metrics_list)
     avg_output_tokens = total_output / n
     
-    # Quality stats
-    quality_scores = [m.quality.score for m in metrics_list]
-    avg_quality = sum(quality_scores) / n
-    min_quality = min(quality_scores)
-    max_quality = max(quality_scores)
-    
     # Throughput
-    total_time_s = sum(latencies) / 1000
+    total_time_s = latency_sum / 1000
     overall_throughput = total_output / total_time_s if total_time_s > 0 else 0
     
     return {
@@ -174,7 +254,7 @@ def aggregate_metrics(metrics_list: list[EvalMetrics]) -> dict:
             "avg_ms": round(avg_latency, 2),
             "min_ms": round(min_latency, 2),
             "max_ms": round(max_latency, 2),
-            "p50_ms": round(sorted(latencies)[n // 2], 2),
+            "p50_ms": round(p50_latency, 2),
         },
         "tokens": {
             "total_input": total_input,
@@ -190,52 +270,234 @@ def aggregate_metrics(metrics_list: list[EvalMetrics]) -> dict:
         "throughput": {
             "tokens_per_second": round(overall_throughput, 1),
         },
-        "estimated_cost_usd": round(
-            total_input * 0.000002 + total_output * 0.000006, 6
-        )
+        "estimated_cost_usd": round(token_cost_usd(model, total_input, total_output), 6)
     }
 
 
-def compare_metrics(metrics_a: EvalMetrics, metrics_b: EvalMetrics) -> dict:
+class Comparison(NamedTuple):
+    """Head-to-head result of compare_metrics."""
+    a_latency_ms: float
+    b_latency_ms: float
+    latency_diff_ms: float
+    faster: str
+    a_output_tokens: int
+    b_output_tokens: int
+    output_tokens_diff: int
+    a_score: float
+    b_score: float
+    score_diff: float
+    better: str
+    overall_winner: str
+    confidence: float
+    
+    def as_dict(self) -> dict:
+        """Nested dict in the shape compare_metrics used to return."""
+        return {
+            "latency": {
+                "a_ms": self.a_latency_ms,
+                "b_ms": self.b_latency_ms,
+                "diff_ms": self.latency_diff_ms,
+                "faster": self.faster
+            },
+            "tokens": {
+                "a_output": self.a_output_tokens,
+                "b_output": self.b_output_tokens,
+                "diff": self.output_tokens_diff
+            },
+            "quality": {
+                "a_score": self.a_score,
+                "b_score": self.b_score,
+                "diff": self.score_diff,
+                "better": self.better
+            },
+            "overall_winner": self.overall_winner,
+            "confidence": self.confidence
+        }
+
+
+def compare_metrics(metrics_a: EvalMetrics, metrics_b: EvalMetrics) -> Comparison:
     """
     Compare metrics between two model runs.
     
-    Returns comparison summary with winner determination.
+    Returns comparison summary with winner determination; use
+    Comparison.as_dict() for a JSON-ready nested dict.
     """
-    comparison = {
-        "latency": {
-            "a_ms": metrics_a.latency.total_ms,
-            "b_ms": metrics_b.latency.total_ms,
-            "diff_ms": round(metrics_b.latency.total_ms - metrics_a.latency.total_ms, 2),
-            "faster": "a" if metrics_a.latency.total_ms < metrics_b.latency.total_ms else "b"
-        },
-        "tokens": {
-            "a_output": metrics_a.tokens.output_tokens,
-            "b_output": metrics_b.tokens.output_tokens,
-            "diff": metrics_b.tokens.output_tokens - metrics_a.tokens.output_tokens
-        },
-        "quality": {
-            "a_score": metrics_a.quality.score,
-            "b_score": metrics_b.quality.score,
-            "diff": round(metrics_b.quality.score - metrics_a.quality.score, 2),
-            "better": "a" if metrics_a.quality.score > metrics_b.quality.score else "b"
-        }
-    }
-    
-    # Determine overall winner (quality weighted more heavily)
-    a_score = (
-        (10 - metrics_a.latency.total_ms / 100) * 0.2 +  # Speed (normalized)
-        metrics_a.quality.score * 0.8  # Quality
-    )
-    b_score = (
-        (10 - metrics_b.latency.total_ms / 100) * 0.2 +
-        metrics_b.quality.score * 0.8
+    lat_a, lat_b = metrics_a.latency.total_ms, metrics_b.latency.total_ms
+    out_a, out_b = metrics_a.tokens.output_tokens, metrics_b.tokens.output_tokens
+    q_a, q_b = metrics_a.quality.score, metrics_b.quality.score
+    
+    # Overall score is 0.2 * (10 - latency_ms / 100) + 0.8 * quality (quality
+    # weighted more heavily); only the difference between a and b matters
+    delta = 0.2 * (lat_b - lat_a) / 100 + 0.8 * (q_a - q_b)
+    
+    return Comparison(
+        a_latency_ms=lat_a,
+        b_latency_ms=lat_b,
+        latency_diff_ms=round(lat_b - lat_a, 2),
+        faster="a" if lat_a < lat_b else "b",
+        a_output_tokens=out_a,
+        b_output_tokens=out_b,
+        output_tokens_diff=out_b - out_a,
+        a_score=q_a,
+        b_score=q_b,
+        score_diff=round(q_b - q_a, 2),
+        better="a" if q_a > q_b else "b",
+        overall_winner="a" if delta > 0 else "b",
+        confidence=round(abs(delta) * 10, 1)
     )
+
+
+class OnlineVariance:
+    """Running mean, sample standard deviation, min and max (Welford's algorithm)."""
+    
+    __slots__ = ("n", "mean", "_m2", "min", "max")
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def update(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
     
-    comparison["overall_winner"] = "a" if a_score > b_score else "b"
-    comparison["confidence"] = round(abs(a_score - b_score) / 10 * 100, 1)
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0.0 for fewer than two values)."""
+        return (self._m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+
+class RunningPercentile:
+    """
+    Sorted sample kept up to date per observation for O(1) quantile reads.
+    
+    Inserts are bisect.insort (O(log n) search plus a memmove), which stays
+    cheap for the run counts seen here without a third-party sorted list.
+    """
     
-    return comparison
+    __slots__ = ("_values",)
+    
+    def __init__(self):
+        self._values: list[float] = []
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def add(self, x: float):
+        bisect.insort(self._values, x)
+    
+    def quantile(self, q: float) -> float:
+        """q-quantile with linear interpolation (the sample is already sorted)."""
+        return _quantile(self._values, q)
+
+
+class VarianceAggregator:
+    """
+    Folds evaluation runs into variance statistics as they complete.
+    
+    Only running moments are kept per run, plus a sorted latency sample
+    for percentiles, so collectors need not outlive add() and the report
+    can be read at any point.
+    
+    Usage:
+        aggregator = VarianceAggregator()
+        for collector, quality_score in runs:
+            aggregator.add(collector, quality_score)
+        metrics = aggregator.finalize()
+    """
+    
+    def __init__(self):
+        self.input_tokens: Optional[int] = None
+        self.latency = OnlineVariance()
+        self.ttft = OnlineVariance()
+        self.tokens_per_second = OnlineVariance()
+        self.output_tokens = OnlineVariance()
+        self.total_tokens = OnlineVariance()
+        self.score = OnlineVariance()
+        self.criteria: defaultdict[str, OnlineVariance] = defaultdict(OnlineVariance)
+        self.feedbacks: list[str] = []
+        self.latency_percentiles = RunningPercentile()
+    
+    @property
+    def runs(self) -> int:
+        return self.latency.n
+    
+    def add(self, collector: "MetricsCollector", quality_score: QualityScore):
+        """Fold in one run."""
+        if self.input_tokens is None:
+            # Tokens are relatively deterministic: report the first run's
+            self.input_tokens = collector.input_tokens
+        
+        latency = collector.total_latency_ms
+        self.latency_percentiles.add(latency)
+        self.latency.update(latency)
+        ttft = collector.time_to_first_token_ms
+        if ttft:
+            self.ttft.update(ttft)
+        tps = collector.tokens_per_second
+        if tps:
+            self.tokens_per_second.update(tps)
+        self.output_tokens.update(collector.output_tokens)
+        self.total_tokens.update(collector.total_tokens)
+        
+        self.score.update(quality_score.score)
+        self.feedbacks.append(quality_score.feedback)
+        for criterion, criterion_score in quality_score.criteria_scores.items():
+            self.criteria[criterion].update(criterion_score)
+    
+    def finalize(self) -> EvalMetricsWithVariance:
+        """Build the variance report for the runs added so far."""
+        n = self.runs
+        if n == 0:
+            raise ValueError("Need at least one run")
+        percentiles = self.latency_percentiles
+        
+        token_metrics = TokenMetrics.model_construct(
+            input_tokens=self.input_tokens,
+            output_tokens=round(self.output_tokens.mean),
+            total_tokens=round(self.total_tokens.mean)
+        )
+        
+        latency_variance = LatencyMetricsWithVariance.model_construct(
+            mean_ms=round(self.latency.mean, 2),
+            std_dev_ms=round(self.latency.stdev, 2),
+            min_ms=round(self.latency.min, 2),
+            max_ms=round(self.latency.max, 2),
+            p50_ms=round(percentiles.quantile(0.5), 2),
+            p95_ms=round(percentiles.quantile(0.95), 2) if n >= 5 else None,
+            mean_ttft_ms=round(self.ttft.mean, 2) if self.ttft.n else None,
+            mean_tokens_per_second=(
+                round(self.tokens_per_second.mean, 1) if self.tokens_per_second.n else None
+            ),
+            runs=n
+        )
+        
+        quality_variance = QualityScoreWithVariance.model_construct(
+            mean_score=round(self.score.mean, 2),
+            std_dev=round(self.score.stdev, 2),
+            min_score=round(self.score.min, 2),
+            max_score=round(self.score.max, 2),
+            runs=n,
+            criteria_means={
+                criterion: round(stats.mean, 2)
+                for criterion, stats in self.criteria.items()
+            },
+            feedbacks=list(self.feedbacks)
+        )
+        
+        return EvalMetricsWithVariance.model_construct(
+            tokens=token_metrics,
+            latency=latency_variance,
+            quality=quality_variance
+        )
 
 
 def compute_variance_metrics(
@@ -246,7 +508,8 @@ def compute_variance_metrics(
     Compute metrics with variance statistics from multiple evaluation runs.
     
     This captures the inherent stochasticity of LLM responses, which is
-    crucial for reliable benchmarking.
+    crucial for reliable benchmarking. Use VarianceAggregator directly to
+    fold runs in as they finish instead of keeping every collector.
     
     Args:
         collectors: List of MetricsCollector from each run
@@ -255,68 +518,10 @@ def compute_variance_metrics(
     Returns:
         EvalMetricsWithVariance with statistical analysis
     """
-    n = len(collectors)
-    if n == 0:
-        raise ValueError("Need at least one run")
-    
-    # Token metrics (use first run - tokens are relatively deterministic)
-    token_metrics = TokenMetrics(
-        input_tokens=collectors[0].input_tokens,
-        output_tokens=round(statistics.mean(c.output_tokens for c in collectors)),
-        total_tokens=round(statistics.mean(c.total_tokens for c in collectors))
-    )
-    
-    # Latency variance
-    latencies = [c.total_latency_ms for c in collectors]
-    ttfts = [c.time_to_first_token_ms for c in collectors if c.time_to_first_token_ms]
-    tps_values = [c.tokens_per_second for c in collectors if c.tokens_per_second]
-    
-    sorted_latencies = sorted(latencies)
-    
-    latency_variance = LatencyMetricsWithVariance(
-        mean_ms=round(statistics.mean(latencies), 2),
-        std_dev_ms=round(statistics.stdev(latencies), 2) if n > 1 else 0.0,
-        min_ms=round(min(latencies), 2),
-        max_ms=round(max(latencies), 2),
-        p50_ms=round(sorted_latencies[n // 2], 2),
-        p95_ms=round(sorted_latencies[int(n * 0.95)], 2) if n >= 5 else None,
-        mean_ttft_ms=round(statistics.mean(ttfts), 2) if ttfts else None,
-        mean_tokens_per_second=round(statistics.mean(tps_values), 1) if tps_values else None,
-        runs=n
-    )
-    
-    # Quality variance
-    scores = [q.score for q in quality_scores]
-    feedbacks = [q.feedback for q in quality_scores]
-    
-    # Aggregate criteria scores
-    all_criteria = {}
-    for q in quality_scores:
-        for criterion, score in q.criteria_scores.items():
-            if criterion not in all_criteria:
-                all_criteria[criterion] = []
-            all_criteria[criterion].append(score)
-    
-    criteria_means = {
-        criterion: round(statistics.mean(values), 2)
-        for criterion, values in all_criteria.items()
-    }
-    
-    quality_variance = QualityScoreWithVariance(
-        mean_score=round(statistics.mean(scores), 2),
-        std_dev=round(statistics.stdev(scores), 2) if n > 1 else 0.0,
-        min_score=round(min(scores), 2),
-        max_score=round(max(scores), 2),
-        runs=n,
-        criteria_means=criteria_means,
-        feedbacks=feedbacks
-    )
-    
-    return EvalMetricsWithVariance(
-        tokens=token_metrics,
-        latency=latency_variance,
-        quality=quality_variance
-    )
+    aggregator = VarianceAggregator()
+    for collector, quality_score in zip(collectors, quality_scores):
+        aggregator.add(collector, quality_score)
+    return aggregator.finalize()
 
 
 def calculate_percentile(values: list[float], percentile: float) -> float:
@@ -0,0 +1,210 @@
+"""
+Storage backends for human ratings.
+
+Every backend keeps running totals (count, sum, 1-5 distribution) on
+write, so /ratings/stats is O(1) regardless of how many ratings exist.
+
+Backends (selected with RATINGS_BACKEND):
+- memory: process-local, lost on restart (default)
+- sqlite: file-backed via the stdlib, shared by workers on one host
+- redis: shared by workers across hosts (requires the redis package)
+"""
+
+import os
+import asyncio
+import sqlite3
+import threading
+from typing import Optional, Protocol
+
+from app.schemas import HumanRating
+
+
+class RatingsBackend(Protocol):
+    """Minimal interface every ratings backend implements."""
+
+    async def append(self, evaluation_id: str, rating: HumanRating) -> None:
+        """Store a rating for an evaluation."""
+        ...
+
+    async def list(self, evaluation_id: str) -> list[HumanRating]:
+        """Return all ratings for an evaluation, oldest first."""
+        ...
+
+    async def stats(self) -> dict:
+        """Return aggregate statistics over all ratings."""
+        ...
+
+
+def _format_stats(evaluations: int, total: int, rating_sum: int, dist: dict[int, int]) -> dict:
+    return {
+        "total_evaluations": evaluations,
+        "total_ratings": total,
+        "average_rating": rating_sum / total if total else None,
+        "distribution": {str(i): dist[i] for i in range(1, 6) if dist.get(i)}
+    }
+
+
+class InMemoryRatings:
+    """Ratings kept in process memory."""
+
+    def __init__(self):
+        self.ratings: dict[str, list[HumanRating]] = {}
+        self.dist = [0] * 6  # index = rating 1..5
+        self.total = 0
+        self.sum = 0
+        self.lock = asyncio.Lock()
+
+    async def append(self, evaluation_id: str, rating: HumanRating) -> None:
+        async with self.lock:
+            self.ratings.setdefault(evaluation_id, []).append(rating)
+            self.dist[rating.rating] += 1
+            self.total += 1
+            self.sum += rating.rating
+
+    async def list(self, evaluation_id: str) -> list[HumanRating]:
+        return self.ratings.get(evaluation_id, [])
+
+    async def stats(self) -> dict:
+        return _format_stats(
+            len(self.ratings), self.total, self.sum, dict(enumerate(self.dist))
+        )
+
+
+class SQLiteRatings:
+    """
+    Ratings persisted to a SQLite file.
+
+    Queries run in a worker thread so the event loop never blocks on disk.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ratings "
+                "(id INTEGER PRIMARY KEY, evaluation_id TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ratings_evaluation_id ON ratings (evaluation_id)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rating_stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def _bump(self, key: str, amount: int):
+        self._conn.execute(
+            "INSERT INTO rating_stats (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, amount)
+        )
+
+    def _append(self, evaluation_id: str, rating: HumanRating):
+        with self._lock, self._conn:
+            is_new = self._conn.execute(
+                "SELECT 1 FROM ratings WHERE evaluation_id = ? LIMIT 1", (evaluation_id,)
+            ).fetchone() is None
+            self._conn.execute(
+                "INSERT INTO ratings (evaluation_id, payload) VALUES (?, ?)",
+                (evaluation_id, rating.model_dump_json())
+            )
+            if is_new:
+                self._bump("evaluations", 1)
+            self._bump("total", 1)
+            self._bump("sum", rating.rating)
+            self._bump(f"dist:{rating.rating}", 1)
+
+    def _list(self, evaluation_id: str) -> list[HumanRating]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM ratings WHERE evaluation_id = ? ORDER BY id", (evaluation_id,)
+            ).fetchall()
+        return [HumanRating.model_validate_json(payload) for (payload,) in rows]
+
+    def _stats(self) -> dict:
+        with self._lock:
+            values = dict(self._conn.execute("SELECT key, value FROM rating_stats").fetchall())
+        dist = {i: values.get(f"dist:{i}", 0) for i in range(1, 6)}
+        return _format_stats(
+            values.get("evaluations", 0), values.get("total", 0), values.get("sum", 0), dist
+        )
+
+    async def append(self, evaluation_id: str, rating: HumanRating) -> None:
+        await asyncio.to_thread(self._append, evaluation_id, rating)
+
+    async def list(self, evaluation_id: str) -> list[HumanRating]:
+        return await asyncio.to_thread(self._list, evaluation_id)
+
+    async def stats(self) -> dict:
+        return await asyncio.to_thread(self._stats)
+
+    async def aclose(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisRatings:
+    """
+    Ratings stored in Redis, one list per evaluation plus global counters.
+
+    Keys:
+        ratings:{evaluation_id}  list of JSON-encoded ratings
+        ratings:evaluation_ids   set of evaluation ids that have ratings
+        ratings:total / :sum     running count and sum
+        ratings:dist             hash rating -> count
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATINGS_BACKEND=redis requires the 'redis' package") from e
+        self._redis = redis.from_url(url)
+
+    async def append(self, evaluation_id: str, rating: HumanRating) -> None:
+        # One MULTI, so a failure can't store the rating without its counters
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.rpush(f"ratings:{evaluation_id}", rating.model_dump_json())
+        pipe.sadd("ratings:evaluation_ids", evaluation_id)
+        pipe.incr("ratings:total")
+        pipe.incrby("ratings:sum", rating.rating)
+        pipe.hincrby("ratings:dist", rating.rating, 1)
+        await pipe.execute()
+
+    async def list(self, evaluation_id: str) -> list[HumanRating]:
+        payloads = await self._redis.lrange(f"ratings:{evaluation_id}", 0, -1)
+        return [HumanRating.model_validate_json(p) for p in payloads]
+
+    async def stats(self) -> dict:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.scard("ratings:evaluation_ids")
+        pipe.get("ratings:total")
+        pipe.get("ratings:sum")
+        pipe.hgetall("ratings:dist")
+        evaluations, total, rating_sum, dist = await pipe.execute()
+        return _format_stats(
+            int(evaluations or 0),
+            int(total or 0),
+            int(rating_sum or 0),
+            {int(k): int(v) for k, v in dist.items()}
+        )
+
+    async def aclose(self):
+        await self._redis.aclose()
+
+
+def create_ratings_backend(kind: Optional[str] = None) -> RatingsBackend:
+    """
+    Build the backend named by RATINGS_BACKEND (memory, sqlite, redis).
+
+    sqlite reads RATINGS_DB_PATH, redis reads REDIS_URL.
+    """
+    kind = (kind or os.getenv("RATINGS_BACKEND", "memory")).lower()
+    if kind == "memory":
+        return InMemoryRatings()
+    if kind == "sqlite":
+        return SQLiteRatings(os.getenv("RATINGS_DB_PATH", "ratings.db"))
+    if kind == "redis":
+        return RedisRatings(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown RATINGS_BACKEND: {kind}")
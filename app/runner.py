@@ -6,13 +6,27 @@ Handles:
 - Batch execution with concurrency control
 - Streaming support
 - Error handling and retries
+- Optional exact-match response cache for replayed datasets
+- Optional semantic cache for near-duplicate prompts
 """
 
+import io
 import os
+import math
+import time
+import hashlib
+import logging
 import asyncio
+import operator
+import contextvars
+from collections import deque
+from contextlib import ExitStack
 from typing import AsyncIterator, Optional
+import httpx
+import orjson
 from dotenv import load_dotenv
 from mistralai import Mistral
+from mistralai.models import SDKError
 
 from app.schemas import (
     EvalPrompt, 
@@ -21,9 +35,230 @@ from app.schemas import (
     EvalMetrics
 )
 from app.metrics import MetricsCollector
+from app.evaluator_cache import InMemoryLLMCache, LLMCache, make_cache_key
+from app.concurrency import (
+    AdaptiveSemaphore,
+    is_throttle_error,
+    is_transient_error,
+    with_retry
+)
+
+logger = logging.getLogger(__name__)
+
+# .env is read lazily by the first runner that needs it, so importing
+# this module has no filesystem side effects
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once():
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+EMBED_MODEL = "mistral-embed"
+
+# Response cache shared by every runner that doesn't bring its own, so
+# short-lived runners (quick_eval builds one per call) still get hits
+_default_response_cache: Optional[LLMCache] = None
+
+
+def get_default_response_cache() -> LLMCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _default_response_cache
+    if _default_response_cache is None:
+        _default_response_cache = InMemoryLLMCache(maxsize=1024)
+    return _default_response_cache
+
+_MODEL_BY_STR: dict[str, MistralModel] = {m.value: m for m in MistralModel}
+
+# Attempts per generation call on 429/5xx before the error surfaces
+GENERATION_ATTEMPTS = 4
+
+# After a failed warmup, batches skip it for this long instead of each
+# paying the warmup timeout again
+WARMUP_RETRY_SECONDS = 60.0
+
+# Size of the HTTP connection pool, and the default ceiling adaptive batch
+# concurrency may grow to: requests beyond it would only queue for a connection
+MAX_CONNECTIONS = 10
+
+# Concurrency limiter of the run_batch call the current task belongs to,
+# so retried 429s inside run_prompt can shrink it
+_BATCH_LIMITER: contextvars.ContextVar[Optional[AdaptiveSemaphore]] = contextvars.ContextVar(
+    "batch_limiter", default=None
+)
+
+
+def _note_retry(exc: BaseException):
+    limiter = _BATCH_LIMITER.get()
+    if limiter is not None and is_throttle_error(exc):
+        limiter.record_throttle()
+
+
+# System prompt per expected style
+_SYSTEM_PROMPTS: dict[str, str] = {
+    "educational": (
+        "You are a helpful educational assistant. Provide clear, "
+        "well-structured explanations that are easy to understand. "
+        "Use examples when helpful."
+    ),
+    "technical": (
+        "You are a technical expert. Provide precise, accurate, "
+        "and detailed technical information. Include relevant "
+        "technical terms and specifications."
+    ),
+    "concise": (
+        "You are a concise assistant. Provide brief, to-the-point "
+        "answers. Avoid unnecessary elaboration while ensuring "
+        "completeness."
+    ),
+    "creative": (
+        "You are a creative assistant. Provide imaginative, "
+        "engaging, and original responses. Feel free to be playful "
+        "with language."
+    ),
+    "formal": (
+        "You are a professional assistant. Provide formal, "
+        "well-structured responses suitable for business or "
+        "academic contexts."
+    ),
+    "conversational": (
+        "You are a friendly conversational assistant. Provide "
+        "natural, engaging responses as if chatting with a friend."
+    )
+}
+
+# System messages are built once and shared by every call. ExpectedStyle
+# is a str enum, so its members hash and compare equal to these keys
+_SYSTEM_MESSAGES: dict[str, dict] = {
+    style: {"role": "system", "content": content}
+    for style, content in _SYSTEM_PROMPTS.items()
+}
+
+
+def _system_message(style) -> dict:
+    """System message for a style (enum or string); unknown styles fall back to educational."""
+    return _SYSTEM_MESSAGES.get(style) or _SYSTEM_MESSAGES["educational"]
+
+
+def _build_messages(prompt: EvalPrompt) -> list[dict]:
+    """Chat messages for a single prompt: shared system message plus the user turn."""
+    return [
+        _system_message(prompt.expected_style),
+        {"role": "user", "content": prompt.prompt}
+    ]
+
+
+def prompt_seed(text: str) -> int:
+    """Stable 32-bit sampling seed derived from the prompt text."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=4).digest(), "little")
+
+
+PACKED_PROMPT = """Answer each of the {count} prompts below independently.
+Reply with a JSON object {{"responses": [...]}} holding one answer string per prompt, in prompt order.
+
+{items}"""
+
+
+def _parse_packed(text: str, count: int) -> Optional[list[str]]:
+    """Extract the answers from a packed reply; None if it is unusable."""
+    try:
+        responses = orjson.loads(text).get("responses")
+    except (orjson.JSONDecodeError, AttributeError):
+        return None
+    if (
+        not isinstance(responses, list)
+        or len(responses) != count
+        or not all(isinstance(r, str) for r in responses)
+    ):
+        return None
+    return responses
+
+
+def _apportion(total: int, weights: list[int]) -> list[int]:
+    """Split an integer total proportionally to weights, preserving the sum."""
+    weight_sum = sum(weights)
+    if weight_sum == 0:
+        weights = [1] * len(weights)
+        weight_sum = len(weights)
+    shares = [total * w // weight_sum for w in weights]
+    shares[-1] += total - sum(shares)
+    return shares
+
+
+_STREAM_END = object()
+
+
+async def _prefetch(stream: AsyncIterator, n: int = 8) -> AsyncIterator:
+    """
+    Iterate stream through a bounded buffer filled by a background task.
+    
+    The socket keeps being read while the consumer processes earlier
+    chunks; at most n chunks are held ahead of the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=n)
+    
+    async def fill():
+        try:
+            async for item in stream:
+                await queue.put((item, None))
+            await queue.put((_STREAM_END, None))
+        except Exception as e:
+            await queue.put((_STREAM_END, e))
+    
+    task = asyncio.create_task(fill())
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _STREAM_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        task.cancel()
+
 
-# Load environment variables
-load_dotenv()
+class SemanticCache:
+    """
+    Embedding-similarity cache for near-duplicate prompts.
+    
+    Returns the stored response of the most similar earlier prompt when
+    cosine similarity reaches threshold ("Explain transformers" vs
+    "Explain the transformer architecture"). Entries only match under the
+    same scope (model, temperature, max_tokens, style). The oldest entries
+    are dropped once maxsize is reached, which also bounds the linear scan.
+    
+    A full scan is about a million multiplies in pure Python, so async
+    callers should run get() in a worker thread (asyncio.to_thread).
+    """
+    
+    def __init__(self, threshold: float = 0.95, maxsize: int = 1024):
+        self.threshold = threshold
+        self._entries: deque[tuple[str, list[float], dict]] = deque(maxlen=maxsize)
+    
+    @staticmethod
+    def normalize(vector: list[float]) -> list[float]:
+        """L2-normalize so a dot product is the cosine similarity."""
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    def get(self, scope: str, embedding: list[float]) -> Optional[dict]:
+        """Return the best match at or above threshold, or None."""
+        best_score, best_value = self.threshold, None
+        # Scan a snapshot: set() may append from the event loop meanwhile
+        for entry_scope, vector, value in list(self._entries):
+            if entry_scope != scope:
+                continue
+            score = sum(map(operator.mul, embedding, vector))
+            if score >= best_score:
+                best_score, best_value = score, value
+        return best_value
+    
+    def set(self, scope: str, embedding: list[float], value: dict):
+        self._entries.append((scope, embedding, value))
 
 
 class MistralRunner:
@@ -37,19 +272,76 @@ class MistralRunner:
     - Retry logic for resilience
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_cache: bool = False,
+        cache: Optional[LLMCache] = None,
+        semantic_cache_threshold: Optional[float] = None
+    ):
         """
         Initialize the runner with API credentials.
         
         Args:
             api_key: Mistral API key. Falls back to MISTRAL_API_KEY env var.
+            use_cache: Serve repeated (prompt, model, temperature, max_tokens,
+                style) calls from cache. Off by default: cache hits report
+                zero latency, which would skew latency benchmarks.
+            cache: Cache backend (defaults to a process-wide 1024-entry LRU
+                shared by all runners)
+            semantic_cache_threshold: Enable the semantic cache, serving
+                prompts whose embedding cosine similarity to an earlier
+                prompt reaches this value (e.g. 0.95). Costs one embeddings
+                call per cache miss.
         """
+        if api_key is None and "MISTRAL_API_KEY" not in os.environ:
+            _load_dotenv_once()
         self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "Mistral API key required. Set MISTRAL_API_KEY env var or pass api_key."
             )
-        self.client = Mistral(api_key=self.api_key)
+        # HTTP/2: concurrent batch calls multiplex over a few warm
+        # connections instead of paying a TCP+TLS handshake each
+        self.client = Mistral(
+            api_key=self.api_key,
+            async_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS
+                ),
+                timeout=60.0
+            )
+        )
+        self._warmed_up = False
+        self._warmup_retry_at = 0.0
+        self.cache = (cache or get_default_response_cache()) if use_cache else None
+        self.semantic_cache = (
+            SemanticCache(threshold=semantic_cache_threshold)
+            if semantic_cache_threshold is not None else None
+        )
+    
+    async def warmup(self, timeout: float = 5.0):
+        """
+        Open the pooled connection ahead of the first timed request.
+        
+        The TCP+TLS handshake otherwise lands in the first prompt's latency
+        and TTFT. Uses the free model listing endpoint, so no tokens are
+        spent. Failures are ignored: the real request will surface them,
+        and warmup is not retried for WARMUP_RETRY_SECONDS.
+        """
+        if self._warmed_up or time.monotonic() < self._warmup_retry_at:
+            return
+        try:
+            await self.client.models.list_async(timeout_ms=int(timeout * 1000))
+            self._warmed_up = True
+        except (SDKError, httpx.HTTPError):
+            self._warmup_retry_at = time.monotonic() + WARMUP_RETRY_SECONDS
+    
+    async def aclose(self):
+        """Close the HTTP connection pool."""
+        await self.client.sdk_configuration.async_client.aclose()
     
     async def run_prompt(
         self,
@@ -57,78 +349,159 @@ class MistralRunner:
         model: MistralModel = MistralModel.MISTRAL_SMALL,
         temperature: float = 0.7,
         max_tokens: int = 1024,
-        use_streaming: bool = True  # Enabled to capture TTFT metrics
+        use_streaming: bool = True,  # Enabled to capture TTFT metrics
+        seed: Optional[int] = None,
+        deterministic: bool = True
     ) -> tuple[str, MetricsCollector]:
         """
         Execute a single prompt and collect metrics.
         
+        By default the sampling seed is derived from the prompt, so the same
+        prompt gives the same output at any temperature and cached responses
+        stay valid. Pass deterministic=False when sampling noise is the point
+        (e.g. variance runs).
+        
         Args:
             prompt: The evaluation prompt to run
             model: Mistral model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
             use_streaming: Whether to use streaming (for TTFT measurement)
+            seed: Explicit sampling seed (overrides deterministic)
+            deterministic: Derive the seed from the prompt when none is given
         
         Returns:
             Tuple of (response_text, metrics_collector)
         """
         collector = MetricsCollector()
         
-        messages = [
-            {
-                "role": "system",
-                "content": self._get_system_prompt(prompt.expected_style)
-            },
-            {
-                "role": "user",
-                "content": prompt.prompt
-            }
-        ]
+        style_value = getattr(prompt.expected_style, 'value', prompt.expected_style)
+        if seed is None and deterministic:
+            seed = prompt_seed(prompt.prompt)
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(
+                kind="generate",
+                model=model.value,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                style=style_value,
+                seed=seed,
+                prompt=prompt.prompt
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # No network call: token counts only, latency stays at zero
+                collector.record_tokens(cached["input_tokens"], cached["output_tokens"])
+                return cached["response"], collector
+        
+        embedding = None
+        if self.semantic_cache is not None:
+            scope = f"{model.value}|{temperature}|{max_tokens}|{style_value}"
+            embedding = await self._embed(prompt.prompt)
+            if embedding is not None:
+                # Off the event loop: the scan would stall concurrent requests
+                cached = await asyncio.to_thread(
+                    self.semantic_cache.get, scope, embedding
+                )
+                if cached is not None:
+                    collector.record_tokens(cached["input_tokens"], cached["output_tokens"])
+                    return cached["response"], collector
+        
+        messages = _build_messages(prompt)
         
         if use_streaming:
             response_text = await self._run_streaming(
-                messages, model, temperature, max_tokens, collector
+                messages, model, temperature, max_tokens, collector, seed
             )
         else:
             response_text = await self._run_sync(
-                messages, model, temperature, max_tokens, collector
+                messages, model, temperature, max_tokens, collector, seed
             )
         
+        entry = {
+            "response": response_text,
+            "input_tokens": collector.input_tokens,
+            "output_tokens": collector.output_tokens
+        }
+        if cache_key is not None:
+            self.cache.set(cache_key, entry)
+        if embedding is not None:
+            self.semantic_cache.set(scope, embedding, entry)
+        
         return response_text, collector
     
+    async def _embed(self, text: str) -> Optional[list[float]]:
+        """Normalized prompt embedding, or None if the embeddings call fails."""
+        try:
+            response = await self.client.embeddings.create_async(
+                model=EMBED_MODEL, inputs=[text]
+            )
+        except (SDKError, httpx.HTTPError):
+            # The cache is an optimization; fall through to generation
+            return None
+        return SemanticCache.normalize(response.data[0].embedding)
+    
     async def _run_streaming(
         self,
         messages: list[dict],
         model: MistralModel,
         temperature: float,
         max_tokens: int,
-        collector: MetricsCollector
+        collector: MetricsCollector,
+        seed: Optional[int] = None
     ) -> str:
-        """Execute with streaming to measure TTFT."""
-        response_chunks = []
-        
-        with collector.measure_latency():
-            async for chunk in self.client.chat.stream_async(
-                model=model.value,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            ):
-                # Mark first token
-                if not response_chunks:
-                    collector.mark_first_token()
-                
-                if chunk.data.choices and len(chunk.data.choices) > 0 and chunk.data.choices[0].delta.content:
-                    response_chunks.append(chunk.data.choices[0].delta.content)
+        """Execute with streaming to measure TTFT, retrying transient errors."""
+        async def attempt() -> str:
+            # Only the successful attempt's timings and usage are kept
+            collector.reset()
+            buf = io.StringIO()
+            write = buf.write
+            first = True
+            usage = None
             
-            # Get final usage from last chunk  
-            if hasattr(chunk.data, 'usage') and chunk.data.usage:
-                collector.record_tokens(
-                    input_tokens=chunk.data.usage.prompt_tokens,
-                    output_tokens=chunk.data.usage.completion_tokens
+            with collector.measure_latency():
+                stream = await self.client.chat.stream_async(
+                    model=model.value,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    random_seed=seed
                 )
+                # Items are handed over as soon as they arrive, never after a
+                # full buffer, so the first-token timestamp is unaffected
+                async for chunk in _prefetch(stream):
+                    # Mark first token
+                    if first:
+                        collector.mark_first_token()
+                        first = False
+                    
+                    data = chunk.data
+                    choices = data.choices
+                    if choices:
+                        content = choices[0].delta.content
+                        if content:
+                            write(content)
+                    
+                    # Usage arrives on the final chunk
+                    if data.usage:
+                        usage = data.usage
+                
+                if usage:
+                    collector.record_tokens(
+                        input_tokens=usage.prompt_tokens,
+                        output_tokens=usage.completion_tokens
+                    )
+            
+            return buf.getvalue()
         
-        return "".join(response_chunks)
+        return await with_retry(
+            attempt,
+            attempts=GENERATION_ATTEMPTS,
+            retry_on=is_transient_error,
+            on_retry=_note_retry
+        )
     
     async def _run_sync(
         self,
@@ -136,16 +509,26 @@ class MistralRunner:
         model: MistralModel,
         temperature: float,
         max_tokens: int,
-        collector: MetricsCollector
+        collector: MetricsCollector,
+        seed: Optional[int] = None
     ) -> str:
-        """Execute without streaming."""
-        with collector.measure_latency():
-            response = await self.client.chat.complete_async(
-                model=model.value,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+        """Execute without streaming, retrying transient errors."""
+        async def attempt():
+            with collector.measure_latency():
+                return await self.client.chat.complete_async(
+                    model=model.value,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    random_seed=seed
+                )
+        
+        response = await with_retry(
+            attempt,
+            attempts=GENERATION_ATTEMPTS,
+            retry_on=is_transient_error,
+            on_retry=_note_retry
+        )
         
         collector.record_tokens(
             input_tokens=response.usage.prompt_tokens,
@@ -160,45 +543,228 @@ class MistralRunner:
         model: MistralModel = MistralModel.MISTRAL_SMALL,
         temperature: float = 0.7,
         max_tokens: int = 1024,
-        concurrency: int = 3
-    ) -> list[tuple[str, MetricsCollector]]:
+        concurrency: int = 3,
+        max_concurrency: Optional[int] = None,
+        capture_ttft: bool = False
+    ) -> AsyncIterator[tuple[int, str, MetricsCollector, Optional[Exception]]]:
         """
-        Execute multiple prompts with controlled concurrency.
+        Execute multiple prompts with adaptive concurrency.
+        
+        Results are yielded as each prompt finishes, so callers can start
+        judging or persisting early results while slower prompts are
+        still generating.
+        
+        Concurrency starts at concurrency, grows towards max_concurrency
+        while requests succeed and halves when the API throttles.
         
         Args:
             prompts: List of prompts to evaluate
             model: Mistral model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens per response
-            concurrency: Max concurrent requests
+            concurrency: Initial concurrent requests
+            max_concurrency: Ceiling for concurrent requests
+                (default: MAX_CONNECTIONS, the connection pool size)
+            capture_ttft: Stream responses to measure time to first token;
+                off by default since a single non-streamed reply is cheaper
         
-        Returns:
-            List of (response_text, metrics_collector) tuples
+        Yields:
+            (index, response_text, metrics_collector, error) in completion
+            order, where index is the prompt's position in prompts. error is
+            None on success; on failure it holds the exception, response_text
+            is an "Error: ..." placeholder and the collector has zero tokens.
+            Failures are logged once, as a single warning, when the batch ends.
         """
-        semaphore = asyncio.Semaphore(concurrency)
+        limiter = AdaptiveSemaphore(
+            concurrency, max_limit=max_concurrency or MAX_CONNECTIONS
+        )
+        # Concurrent requests then multiplex over an established connection
+        await self.warmup()
         
-        async def run_with_semaphore(prompt: EvalPrompt):
-            async with semaphore:
-                return await self.run_prompt(
-                    prompt, model, temperature, max_tokens
+        async def run_limited(i: int, prompt: EvalPrompt):
+            # Each task runs in its own context copy, so this stays local
+            _BATCH_LIMITER.set(limiter)
+            try:
+                async with limiter:
+                    response_text, collector = await self.run_prompt(
+                        prompt, model, temperature, max_tokens,
+                        use_streaming=capture_ttft
+                    )
+            except Exception as e:
+                # Create a failed result
+                collector = MetricsCollector()
+                collector.record_tokens(0, 0)
+                return i, f"Error: {e}", collector, e
+            return i, response_text, collector, None
+        
+        tasks = [
+            asyncio.create_task(run_limited(i, p))
+            for i, p in enumerate(prompts)
+        ]
+        errors: list[tuple[int, Exception]] = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result[3] is not None:
+                    errors.append((result[0], result[3]))
+                yield result
+        finally:
+            # Consumer stopped early: don't leave requests running
+            for task in tasks:
+                task.cancel()
+            if errors:
+                logger.warning(
+                    "run_batch: %d of %d prompts failed: %r",
+                    len(errors), len(prompts), errors
                 )
+    
+    async def run_batch_list(
+        self,
+        prompts: list[EvalPrompt],
+        model: MistralModel = MistralModel.MISTRAL_SMALL,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        concurrency: int = 3,
+        max_concurrency: Optional[int] = None,
+        capture_ttft: bool = False
+    ) -> list[tuple[str, MetricsCollector, Optional[Exception]]]:
+        """
+        Execute multiple prompts and return all results in input order.
+        
+        Returns:
+            List of (response_text, metrics_collector, error) tuples
+        """
+        results: list[tuple[str, MetricsCollector, Optional[Exception]]] = [None] * len(prompts)
+        async for i, response_text, collector, error in self.run_batch(
+            prompts, model, temperature, max_tokens, concurrency, max_concurrency,
+            capture_ttft
+        ):
+            results[i] = (response_text, collector, error)
+        return results
+    
+    async def run_batch_packed(
+        self,
+        prompts: list[EvalPrompt],
+        model: MistralModel = MistralModel.MISTRAL_SMALL,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        pack: int = 8,
+        concurrency: int = 3
+    ) -> list[tuple[str, MetricsCollector, Optional[Exception]]]:
+        """
+        Execute prompts packed several to a request, in input order.
         
-        tasks = [run_with_semaphore(p) for p in prompts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Prompts sharing a style are sent pack at a time in one request
+        asking for a JSON list of answers, saving a round-trip per prompt.
+        Each result shares its request's latency and tokens are split by
+        text length. A chunk whose reply cannot be split falls back to one
+        request per prompt, under the same concurrency limit.
         
-        # Filter out exceptions and log them
-        valid_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                print(f"Error on prompt {i}: {result}")
-                # Create a failed result
+        Useful for short completions on small models, where per-call
+        overhead dominates.
+        
+        Returns:
+            List of (response_text, metrics_collector, error) tuples, as
+            from run_batch_list
+        """
+        by_style: dict[str, list[int]] = {}
+        for i, prompt in enumerate(prompts):
+            style_value = getattr(prompt.expected_style, 'value', prompt.expected_style)
+            by_style.setdefault(style_value, []).append(i)
+        chunks = [
+            indices[start:start + pack]
+            for indices in by_style.values()
+            for start in range(0, len(indices), pack)
+        ]
+        
+        results: list[tuple[str, MetricsCollector, Optional[Exception]]] = [None] * len(prompts)
+        limiter = AdaptiveSemaphore(concurrency)
+        
+        async def run_single(prompt: EvalPrompt):
+            try:
+                async with limiter:
+                    response_text, collector = await self.run_prompt(
+                        prompt, model, temperature, max_tokens, use_streaming=False
+                    )
+            except Exception as e:
                 collector = MetricsCollector()
-                collector.record_tokens(0, 0)
-                valid_results.append((f"Error: {result}", collector))
-            else:
-                valid_results.append(result)
+                return f"Error: {e}", collector, e
+            return response_text, collector, None
+        
+        async def run_chunk(indices: list[int]):
+            _BATCH_LIMITER.set(limiter)
+            chunk = [prompts[i] for i in indices]
+            try:
+                async with limiter:
+                    packed = await self._run_packed(
+                        chunk, model, temperature, max_tokens
+                    )
+            except Exception as e:
+                logger.warning("Packed request failed, running prompts individually: %s", e)
+                packed = None
+            if packed is None:
+                packed = await asyncio.gather(*(run_single(prompt) for prompt in chunk))
+            for i, result in zip(indices, packed):
+                results[i] = result
         
-        return valid_results
+        await asyncio.gather(*(run_chunk(indices) for indices in chunks))
+        return results
+    
+    async def _run_packed(
+        self,
+        chunk: list[EvalPrompt],
+        model: MistralModel,
+        temperature: float,
+        max_tokens: int
+    ) -> Optional[list[tuple[str, MetricsCollector, Optional[Exception]]]]:
+        """Run one packed request; None if the reply cannot be split."""
+        items = "\n\n".join(
+            f"# Prompt {n}\n{prompt.prompt}" for n, prompt in enumerate(chunk, 1)
+        )
+        messages = [
+            _system_message(chunk[0].expected_style),
+            {
+                "role": "user",
+                "content": PACKED_PROMPT.format(count=len(chunk), items=items)
+            }
+        ]
+        collectors = [MetricsCollector() for _ in chunk]
+        
+        async def attempt():
+            # Every prompt in the chunk is timed by the same request
+            with ExitStack() as stack:
+                for collector in collectors:
+                    stack.enter_context(collector.measure_latency())
+                return await self.client.chat.complete_async(
+                    model=model.value,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens * len(chunk),
+                    response_format={"type": "json_object"}
+                )
+        
+        response = await with_retry(
+            attempt,
+            attempts=GENERATION_ATTEMPTS,
+            retry_on=is_transient_error,
+            on_retry=_note_retry
+        )
+        
+        responses = _parse_packed(response.choices[0].message.content or "", len(chunk))
+        if responses is None:
+            return None
+        
+        input_shares = _apportion(
+            response.usage.prompt_tokens, [len(p.prompt) for p in chunk]
+        )
+        output_shares = _apportion(
+            response.usage.completion_tokens, [len(r) for r in responses]
+        )
+        for collector, input_tokens, output_tokens in zip(
+            collectors, input_shares, output_shares
+        ):
+            collector.record_tokens(input_tokens, output_tokens)
+        return [(response, collector, None) for response, collector in zip(responses, collectors)]
     
     async def stream_response(
         self,
@@ -212,86 +778,58 @@ class MistralRunner:
         
         Yields individual tokens/chunks as they arrive.
         """
-        messages = [
-            {
-                "role": "system",
-                "content": self._get_system_prompt(prompt.expected_style)
-            },
-            {
-                "role": "user",
-                "content": prompt.prompt
-            }
-        ]
+        messages = _build_messages(prompt)
         
-        async for chunk in self.client.chat.stream_async(
+        stream = await self.client.chat.stream_async(
             model=model.value,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens
-        ):
-            if chunk.data.choices and len(chunk.data.choices) > 0 and chunk.data.choices[0].delta.content:
-                yield chunk.data.choices[0].delta.content
-    
-    def _get_system_prompt(self, style) -> str:
-        """Get system prompt based on expected style."""
-        style_prompts = {
-            "educational": (
-                "You are a helpful educational assistant. Provide clear, "
-                "well-structured explanations that are easy to understand. "
-                "Use examples when helpful."
-            ),
-            "technical": (
-                "You are a technical expert. Provide precise, accurate, "
-                "and detailed technical information. Include relevant "
-                "technical terms and specifications."
-            ),
-            "concise": (
-                "You are a concise assistant. Provide brief, to-the-point "
-                "answers. Avoid unnecessary elaboration while ensuring "
-                "completeness."
-            ),
-            "creative": (
-                "You are a creative assistant. Provide imaginative, "
-                "engaging, and original responses. Feel free to be playful "
-                "with language."
-            ),
-            "formal": (
-                "You are a professional assistant. Provide formal, "
-                "well-structured responses suitable for business or "
-                "academic contexts."
-            ),
-            "conversational": (
-                "You are a friendly conversational assistant. Provide "
-                "natural, engaging responses as if chatting with a friend."
-            )
-        }
-        
-        # Handle both string and enum
-        style_key = style.value if hasattr(style, 'value') else style
-        return style_prompts.get(style_key, style_prompts["educational"])
+        )
+        async for chunk in stream:
+            choices = chunk.data.choices
+            if choices:
+                content = choices[0].delta.content
+                if content:
+                    yield content
 
 
 # Utility function for simple usage
 async def quick_eval(
     prompt: str,
     model: str = "mistral-small-latest",
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    use_cache: bool = False,
+    capture_ttft: bool = True
 ) -> dict:
     """
     Quick evaluation of a single prompt.
     
+    With capture_ttft=False the response is fetched in one non-streamed
+    call and ttft_ms is None. The runner is not warmed up, so latency_ms
+    includes connection setup.
+    
     Example:
         result = await quick_eval("What is machine learning?")
         print(result["response"])
         print(result["metrics"])
     """
-    runner = MistralRunner(api_key=api_key)
     eval_prompt = EvalPrompt(prompt=prompt)
     
-    # Convert string model to enum if needed
-    model_enum = MistralModel(model) if isinstance(model, str) else model
+    # Members hash and compare equal to their values, so one lookup
+    # resolves both enum members and model name strings
+    model_enum = _MODEL_BY_STR.get(model)
+    if model_enum is None:
+        raise ValueError(f"Unknown model: {model!r}")
     
-    response, collector = await runner.run_prompt(eval_prompt, model=model_enum)
+    # One-off runner: close its HTTP client before returning
+    runner = MistralRunner(api_key=api_key, use_cache=use_cache)
+    try:
+        response, collector = await runner.run_prompt(
+            eval_prompt, model=model_enum, use_streaming=capture_ttft
+        )
+    finally:
+        await runner.aclose()
     
     return {
         "prompt": prompt,
@@ -44,11 +44,38 @@ class HumanRating(BaseModel):
     Human scores can be used to identify bias in automated evaluation
     and improve the judge model over time.
     """
-    score: float = Field(..., ge=0.0, le=10.0, description="Human quality score 0-10")
+    evaluation_id: str = Field(..., description="Evaluation the rating refers to")
+    rating: int = Field(..., ge=1, le=5, description="Human rating 1-5")
     comment: Optional[str] = Field(default=None, description="Human feedback comment")
     rater_id: Optional[str] = Field(default=None, description="Identifier for the human rater")
 
 
+# ============ Judge Output ============
+
+class JudgeOutput(BaseModel):
+    """
+    Structured verdict expected from the LLM judge.
+    
+    Validated strictly: a missing or out-of-range criterion is a
+    parsing error rather than a silent default.
+    """
+    clarity: float = Field(..., ge=0.0, le=10.0)
+    accuracy: float = Field(..., ge=0.0, le=10.0)
+    completeness: float = Field(..., ge=0.0, le=10.0)
+    relevance: float = Field(..., ge=0.0, le=10.0)
+    style_match: float = Field(..., ge=0.0, le=10.0)
+    overall_score: Optional[float] = Field(default=None, ge=0.0, le=10.0)
+    feedback: str = Field(
+        ...,
+        description="2-3 sentence summary of strengths and areas for improvement"
+    )
+
+
+class JudgeBatchOutput(BaseModel):
+    """Verdicts for several rows judged in one call, in row order."""
+    results: list[JudgeOutput]
+
+
 # ============ Input Schemas ============
 
 class EvalPrompt(BaseModel):
@@ -119,6 +146,12 @@ class BatchEvalRequest(BaseModel):
     temperature: float = Field(default=0.7, ge=0.0, le=1.0)
     max_tokens: int = Field(default=1024, ge=1, le=4096)
     runs: int = Field(default=1, ge=1, le=10)
+    marshal_size: int = Field(
+        default=1,
+        ge=1,
+        le=8,
+        description="Rows judged per judge call (1 = one call per prompt)"
+    )
 
 
 class CompareRequest(BaseModel):
@@ -148,7 +181,32 @@ class VarianceStats(BaseModel):
     runs: int = Field(..., description="Number of runs")
 
 
+# Approximate list prices as (input, output) in US cents per million tokens.
+# Kept as ints so cost sums stay exact until the final division.
+_PRICE_CENTS_PER_MTOK: dict[str, tuple[int, int]] = {
+    "mistral-tiny": (25, 25),
+    "mistral-small-latest": (200, 600),
+    "mistral-medium-latest": (270, 810),
+    "mistral-large-latest": (800, 2400),
+    "open-mistral-7b": (25, 25),
+    "open-mixtral-8x7b": (70, 70),
+    "open-mixtral-8x22b": (200, 600),
+}
+_DEFAULT_PRICE = _PRICE_CENTS_PER_MTOK["mistral-small-latest"]
+
+
+def token_cost_usd(model: Optional[str], input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a token count at a model's pricing."""
+    in_rate, out_rate = _PRICE_CENTS_PER_MTOK.get(
+        getattr(model, "value", model), _DEFAULT_PRICE
+    )
+    return (input_tokens * in_rate + output_tokens * out_rate) / 100_000_000
+
+
 # ============ Output Schemas ============
+# Built from values the app computes itself, so internal code creates
+# them with model_construct() (no validation). Request schemas above are
+# always fully validated.
 
 class TokenMetrics(BaseModel):
     """Token usage metrics."""
@@ -156,13 +214,9 @@ class TokenMetrics(BaseModel):
     output_tokens: int = Field(..., description="Number of output tokens")
     total_tokens: int = Field(..., description="Total tokens used")
     
-    @property
-    def estimated_cost_usd(self) -> float:
-        """Estimate cost based on typical Mistral pricing."""
-        # Approximate pricing (varies by model)
-        input_cost = self.input_tokens * 0.000002
-        output_cost = self.output_tokens * 0.000006
-        return round(input_cost + output_cost, 6)
+    def cost_usd(self, model: str) -> float:
+        """Estimate cost for this usage at the given model's pricing."""
+        return token_cost_usd(model, self.input_tokens, self.output_tokens)
 
 
 class LatencyMetrics(BaseModel):
@@ -284,6 +338,10 @@ class BatchEvalResult(BaseModel):
         default_factory=dict,
         description="Aggregated statistics"
     )
+    errors: list[dict] = Field(
+        default_factory=list,
+        description="Prompts whose generation failed, with the error message"
+    )
 
 
 class EvalResultWithVariance(BaseModel):
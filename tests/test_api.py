@@ -0,0 +1,56 @@
+"""API tests that don't need a Mistral key."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.ratings import InMemoryRatings
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "ratings_store", InMemoryRatings())
+    return TestClient(main.app)
+
+
+def test_rating_round_trip(client):
+    response = client.post("/rate/eval-1", params={"rating": 4, "comment": "solid"})
+    assert response.status_code == 200
+    assert response.json()["rating"] == 4
+
+    client.post("/rate/eval-1", params={"rating": 2, "rater_id": "r2"})
+    ratings = client.get("/rate/eval-1").json()
+    assert [r["rating"] for r in ratings] == [4, 2]
+    assert ratings[0]["comment"] == "solid"
+    assert client.get("/rate/unknown").json() == []
+
+
+def test_rating_stats(client):
+    assert client.get("/ratings/stats").json()["average_rating"] is None
+    for evaluation_id, rating in [("a", 5), ("a", 3), ("b", 4)]:
+        client.post(f"/rate/{evaluation_id}", params={"rating": rating})
+
+    stats = client.get("/ratings/stats").json()
+    assert stats["total_evaluations"] == 2
+    assert stats["total_ratings"] == 3
+    assert stats["average_rating"] == 4.0
+    assert stats["distribution"] == {"3": 1, "4": 1, "5": 1}
+
+
+def test_rating_out_of_range_is_rejected(client):
+    assert client.post("/rate/eval-1", params={"rating": 6}).status_code == 422
+
+
+def test_datasets_skip_files_that_are_not_objects(client, monkeypatch, tmp_path):
+    (tmp_path / "good.json").write_text('{"description": "ok", "prompts": [{"prompt": "Hi"}]}')
+    (tmp_path / "list.json").write_text('[{"prompt": "Hi"}]')
+    monkeypatch.setattr(main, "DATASETS_DIR", tmp_path)
+    monkeypatch.setattr(main, "_dataset_cache", {})
+
+    response = client.get("/datasets")
+    assert response.status_code == 200
+    assert [d["name"] for d in response.json()] == ["good"]
+
+    response = client.get("/datasets/list")
+    assert response.status_code == 500
+    assert "JSON object" in response.json()["detail"]
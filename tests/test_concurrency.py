@@ -0,0 +1,222 @@
+"""Tests for the rate limiter and retry helpers, run against a fake clock."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Optional
+
+import httpx
+import pytest
+from mistralai.models import SDKError
+
+from app import concurrency
+from app.concurrency import (
+    AdaptiveSemaphore,
+    AsyncRateLimiter,
+    is_rate_limit_error,
+    is_transient_error,
+    retry_after_seconds,
+    with_retry,
+)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(concurrency, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(concurrency.asyncio, "sleep", fake.sleep)
+    monkeypatch.setattr(concurrency.random, "uniform", lambda a, b: 0.0)
+    return fake
+
+
+def sdk_error(status_code: int, retry_after: Optional[str] = None) -> SDKError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    return SDKError("API error occurred", status_code, "", httpx.Response(status_code, headers=headers))
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_a_burst_then_spaces_requests(clock):
+    limiter = AsyncRateLimiter(2, 1.0)
+    for _ in range(2):
+        await limiter.acquire()
+    assert clock.sleeps == []
+
+    await limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_drains_while_idle(clock):
+    limiter = AsyncRateLimiter(2, 1.0)
+    async with limiter:
+        pass
+    async with limiter:
+        pass
+    clock.now += 1.0
+    await limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(sdk_error(429))
+    assert not is_rate_limit_error(sdk_error(500))
+    assert not is_rate_limit_error(ValueError("429"))
+
+
+@pytest.mark.asyncio
+async def test_with_retry_backs_off_exponentially_on_429(clock):
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls < 4:
+            raise sdk_error(429)
+        return "ok"
+
+    assert await with_retry(call, attempts=5, initial_delay=1.0) == "ok"
+    assert calls == 4
+    assert clock.sleeps == [1.0, 2.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_with_retry_caps_the_delay(clock):
+    async def call():
+        raise sdk_error(429)
+
+    with pytest.raises(SDKError):
+        await with_retry(call, attempts=4, initial_delay=1.0, max_delay=3.0)
+    assert clock.sleeps == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_with_retry_raises_non_retryable_errors_at_once(clock):
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise sdk_error(400)
+
+    with pytest.raises(SDKError):
+        await with_retry(call)
+    assert calls == 1
+    assert clock.sleeps == []
+
+
+def test_is_transient_error():
+    assert all(is_transient_error(sdk_error(code)) for code in (429, 500, 502, 503, 504))
+    assert not is_transient_error(sdk_error(400))
+    assert not is_transient_error(sdk_error(401))
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(sdk_error(429, "2.5")) == 2.5
+    assert retry_after_seconds(sdk_error(429, "-1")) == 0.0
+    assert retry_after_seconds(sdk_error(429)) is None
+    assert retry_after_seconds(sdk_error(429, "Wed, 21 Oct 2015 07:28:00 GMT")) is None
+    assert retry_after_seconds(SDKError("no response", 429)) is None
+
+
+@pytest.mark.asyncio
+async def test_with_retry_honours_retry_after(clock):
+    errors = [sdk_error(503, "7"), sdk_error(429, "60")]
+
+    async def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    result = await with_retry(call, retry_on=is_transient_error, max_delay=30.0)
+    assert result == "ok"
+    # Retry-After replaces the backoff but is still capped at max_delay
+    assert clock.sleeps == [7.0, 30.0]
+
+
+@pytest.mark.asyncio
+async def test_with_retry_reports_each_retry(clock):
+    seen = []
+    errors = [sdk_error(429), sdk_error(502)]
+
+    async def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    await with_retry(call, retry_on=is_transient_error, on_retry=seen.append)
+    assert [e.status_code for e in seen] == [429, 502]
+
+
+@pytest.mark.asyncio
+async def test_adaptive_semaphore_grows_after_a_success_streak(clock):
+    sem = AdaptiveSemaphore(2, max_limit=3, increase_every=2)
+    for _ in range(4):
+        async with sem:
+            pass
+    # Grew once after two successes, then stopped at max_limit
+    assert sem.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_semaphore_halves_once_per_cooldown(clock):
+    sem = AdaptiveSemaphore(8, min_limit=1, cooldown=1.0)
+    sem.record_throttle()
+    sem.record_throttle()  # same burst of 429s
+    assert sem.limit == 4
+
+    clock.now += 1.0
+    sem.record_throttle()
+    assert sem.limit == 2
+    for _ in range(3):
+        clock.now += 1.0
+        sem.record_throttle()
+    assert sem.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_adaptive_semaphore_throttles_on_429_and_timeouts(clock):
+    sem = AdaptiveSemaphore(8, increase_every=1)
+    with pytest.raises(SDKError):
+        async with sem:
+            raise sdk_error(429)
+    assert sem.limit == 4
+
+    clock.now += 1.0
+    with pytest.raises(httpx.ReadTimeout):
+        async with sem:
+            raise httpx.ReadTimeout("slow")
+    assert sem.limit == 2
+
+    # Other failures neither shrink the limit nor count as successes
+    with pytest.raises(SDKError):
+        async with sem:
+            raise sdk_error(400)
+    assert sem.limit == 2
+    assert sem.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_semaphore_blocks_at_the_limit():
+    sem = AdaptiveSemaphore(1)
+    await sem.acquire()
+    waiter = asyncio.create_task(sem.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await sem.release()
+    await asyncio.wait_for(waiter, 1)
+    assert sem.in_flight == 1
@@ -0,0 +1,280 @@
+"""Tests for judge reply handling (no API calls)."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app import evaluator
+from app.concurrency import AsyncRateLimiter
+from app.evaluator import _JSONObjectScanner, _stream_json
+from app.evaluator_cache import FileLLMCache
+from app.schemas import ExpectedStyle, QualityScore
+
+
+def _scan(chunks: list[str]) -> str:
+    """Feed chunks like _stream_json does and return the text kept."""
+    scanner = _JSONObjectScanner()
+    parts = []
+    for text in chunks:
+        end = scanner.feed(text)
+        if end != -1:
+            parts.append(text[:end])
+            break
+        parts.append(text)
+    return "".join(parts)
+
+
+def test_scanner_stops_at_the_closing_brace():
+    assert _scan(['{"score": 7}', ' trailing']) == '{"score": 7}'
+    assert _scan(['{"score": 7} trailing']) == '{"score": 7}'
+
+
+def test_scanner_handles_objects_split_across_chunks():
+    reply = '{"scores": {"clarity": 8, "accuracy": 9}, "feedback": "ok"}'
+    chunks = [reply[i:i + 3] for i in range(0, len(reply), 3)]
+    assert _scan(chunks + ["\n\nextra"]) == reply
+
+
+def test_scanner_ignores_braces_inside_strings():
+    reply = '{"feedback": "use {braces} and \\"}\\" freely"}'
+    assert _scan([reply[:20], reply[20:], " {"]) == reply
+
+
+def test_scanner_handles_an_escape_split_from_its_character():
+    reply = '{"feedback": "a \\"}\\" b"}'
+    split = reply.index("\\") + 1
+    assert _scan([reply[:split], reply[split:]]) == reply
+
+
+def test_scanner_reports_an_unclosed_object():
+    scanner = _JSONObjectScanner()
+    assert scanner.feed('{"feedback": "}"') == -1
+    assert scanner.depth == 1
+
+
+def _chunk(content):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(data=SimpleNamespace(choices=[SimpleNamespace(delta=delta)]))
+
+
+class FakeStream:
+    def __init__(self, contents):
+        self.contents = list(contents)
+        self.consumed = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed == len(self.contents):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return _chunk(self.contents[self.consumed - 1])
+
+
+@pytest.mark.asyncio
+async def test_stream_json_returns_once_the_object_closes():
+    stream = FakeStream(['{"score"', ': 7}', None, "ignored"])
+
+    async def stream_async(**kwargs):
+        return stream
+
+    client = SimpleNamespace(chat=SimpleNamespace(stream_async=stream_async))
+    text = await _stream_json(client, AsyncRateLimiter(1000, 60), model="m")
+    assert text == '{"score": 7}'
+    assert stream.consumed == 2
+
+    # The rest of the stream is drained in the background
+    await asyncio.gather(*evaluator._background_tasks)
+    assert stream.consumed == 4
+
+
+@pytest.fixture
+def judge():
+    return evaluator.LLMEvaluator(api_key="test-key", use_cache=False)
+
+
+def test_parse_evaluation_weights_the_criteria(judge):
+    score = judge._parse_evaluation(
+        '{"clarity": 10, "accuracy": 10, "completeness": 0, '
+        '"relevance": 10, "style_match": 10, "feedback": "Good."}'
+    )
+    assert score.score == 7.5
+    assert score.feedback == "Good."
+    assert score.criteria_scores["completeness"] == 0
+
+
+def test_parse_evaluation_prefers_the_judges_overall_score(judge):
+    score = judge._parse_evaluation(
+        '{"clarity": 8, "accuracy": 8, "completeness": 8, "relevance": 8, '
+        '"style_match": 8, "overall_score": 6.3, "feedback": "ok"}'
+    )
+    assert score.score == 6.3
+
+
+@pytest.mark.asyncio
+async def test_file_cache_io_runs_off_the_event_loop(monkeypatch, tmp_path):
+    loop_thread = threading.get_ident()
+    io_threads = []
+
+    class RecordingCache(FileLLMCache):
+        def get(self, key):
+            io_threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value, ttl=None):
+            io_threads.append(threading.get_ident())
+            super().set(key, value, ttl)
+
+    calls = []
+
+    async def stream_json(client, limiter, **kwargs):
+        calls.append(kwargs["model"])
+        return (
+            '{"clarity": 8, "accuracy": 8, "completeness": 8, '
+            '"relevance": 8, "style_match": 8, "feedback": "ok"}'
+        )
+
+    monkeypatch.setattr(evaluator, "_stream_json", stream_json)
+    judge = evaluator.LLMEvaluator(api_key="test-key", cache=RecordingCache(tmp_path))
+
+    first = await judge.evaluate("q", "a")
+    second = await judge.evaluate("q", "a")
+    assert second == first
+    assert len(calls) == 1
+    assert len(io_threads) == 3  # miss, store, hit
+    assert loop_thread not in io_threads
+
+
+@pytest.mark.parametrize("reply", [
+    "not json",
+    '{"clarity": 8, "feedback": "missing criteria"}',
+    '{"clarity": 11, "accuracy": 8, "completeness": 8, "relevance": 8, '
+    '"style_match": 8, "feedback": "out of range"}',
+])
+def test_parse_evaluation_falls_back_on_invalid_replies(judge, reply):
+    score = judge._parse_evaluation(reply)
+    assert score.score == 5.0
+    assert score.feedback.startswith("Evaluation parsing error")
+    assert score.criteria_scores == {}
+
+
+def _fake_evaluate(calls: list):
+    async def evaluate(prompt, response, expected_style=None, reference_answer=None):
+        calls.append(prompt)
+        return QualityScore(
+            score=8.0, feedback=f"judged {prompt}", criteria_scores={"clarity": 8.0}
+        )
+    return evaluate
+
+
+ITEMS = [(f"p{i}", f"r{i}", ExpectedStyle.CONCISE, None) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_resumes_from_checkpoint(judge, tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    calls = []
+    judge.evaluate = _fake_evaluate(calls)
+
+    first = await judge.evaluate_many(ITEMS[:2], checkpoint_path=checkpoint)
+    assert calls == ["p0", "p1"]
+    assert len(checkpoint.read_bytes().splitlines()) == 2
+
+    calls.clear()
+    second = await judge.evaluate_many(ITEMS, checkpoint_path=checkpoint)
+    assert calls == ["p2"]
+    assert second[:2] == first
+    assert [s.feedback for s in second] == ["judged p0", "judged p1", "judged p2"]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_skips_a_torn_checkpoint_line(judge, tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    calls = []
+    judge.evaluate = _fake_evaluate(calls)
+    await judge.evaluate_many(ITEMS[:2], checkpoint_path=checkpoint)
+
+    # Simulate a crash halfway through writing the second record
+    lines = checkpoint.read_bytes().splitlines(keepends=True)
+    checkpoint.write_bytes(lines[0] + lines[1][:25])
+
+    calls.clear()
+    await judge.evaluate_many(ITEMS[:2], checkpoint_path=checkpoint)
+    assert calls == ["p1"]
+
+    # The record written after the torn line must be readable on the next run
+    calls.clear()
+    await judge.evaluate_many(ITEMS[:2], checkpoint_path=checkpoint)
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_does_not_checkpoint_parse_failures(judge, tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+
+    async def evaluate(prompt, response, expected_style=None, reference_answer=None):
+        return QualityScore(score=5.0, feedback="Evaluation parsing error", criteria_scores={})
+
+    judge.evaluate = evaluate
+    await judge.evaluate_many(ITEMS[:1], checkpoint_path=checkpoint)
+    assert checkpoint.read_bytes() == b""
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_returns_exceptions_in_place(judge):
+    async def evaluate(prompt, response, expected_style=None, reference_answer=None):
+        if prompt == "p1":
+            raise RuntimeError("judge down")
+        return QualityScore(score=8.0, feedback="", criteria_scores={})
+
+    judge.evaluate = evaluate
+    results = await judge.evaluate_many(ITEMS)
+    assert isinstance(results[1], RuntimeError)
+    assert results[0].score == results[2].score == 8.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("message", [
+    None,
+    SimpleNamespace(content=None),
+    SimpleNamespace(content="not json"),
+    SimpleNamespace(content='["A"]'),
+])
+async def test_single_call_compare_degrades_to_a_tie(judge, monkeypatch, message):
+    async def complete(client, limiter, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(evaluator, "_complete", complete)
+    result = await judge.compare_responses("q", "a", "b", mode="single_call")
+    assert result["winner"] == "tie"
+    assert result["reasoning"] == "Could not parse comparison"
+
+
+@pytest.mark.asyncio
+async def test_marshaled_fallback_stays_within_max_concurrency(judge):
+    in_flight = peak = 0
+
+    async def judge_marshaled(style_value, rows):
+        return None  # Unusable group reply
+
+    async def evaluate(prompt, response, expected_style=None, reference_answer=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if prompt == "p2":
+            raise RuntimeError("judge down")
+        return QualityScore(score=7.0, feedback=prompt, criteria_scores={"clarity": 7.0})
+
+    judge._judge_marshaled = judge_marshaled
+    judge.evaluate = evaluate
+    items = [(f"p{i}", f"r{i}", ExpectedStyle.CONCISE, None) for i in range(4)]
+
+    results = await judge.evaluate_marshaled(items, batch_size=2, max_concurrency=1)
+    assert [r.feedback for r in results if isinstance(r, QualityScore)] == ["p0", "p1", "p3"]
+    assert isinstance(results[2], RuntimeError)
+    assert peak == 1
@@ -0,0 +1,77 @@
+"""Tests for cache keys and the judge cache backends."""
+
+import time
+
+from app.evaluator_cache import FileLLMCache, InMemoryLLMCache, make_cache_key
+
+
+def test_cache_key_ignores_argument_order():
+    assert make_cache_key(a=1, b="x") == make_cache_key(b="x", a=1)
+
+
+def test_cache_key_depends_on_every_field():
+    base = make_cache_key(model="m", prompt="p", temperature=0.7)
+    assert base != make_cache_key(model="m", prompt="p", temperature=0.2)
+    assert base != make_cache_key(model="m", prompt="q", temperature=0.7)
+    assert base != make_cache_key(model="m", prompt="p", temperature=0.7, seed=1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = InMemoryLLMCache(maxsize=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # "b" is now the oldest
+    cache.set("c", {"v": 3})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+
+def test_expired_entries_are_misses():
+    cache = InMemoryLLMCache(maxsize=4, ttl=60)
+    cache.set("old", {"v": 1}, ttl=-1)
+    cache.set("new", {"v": 2})
+
+    assert cache.get("old") is None
+    assert cache.get("new") == {"v": 2}
+    assert len(cache) == 1
+
+
+def test_ttl_uses_monotonic_clock(monkeypatch):
+    now = time.monotonic()
+    cache = InMemoryLLMCache(maxsize=4, ttl=10)
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("k", {"v": 1})
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("k") is None
+
+
+def test_file_cache_round_trip(tmp_path):
+    cache = FileLLMCache(tmp_path)
+    cache.set("k", {"score": 7.5})
+    assert FileLLMCache(tmp_path).get("k") == {"score": 7.5}
+    assert cache.get("missing") is None
+
+
+def test_file_cache_drops_expired_and_corrupt_entries(tmp_path):
+    cache = FileLLMCache(tmp_path)
+    cache.set("old", {"v": 1}, ttl=-1)
+    assert cache.get("old") is None
+    assert not (tmp_path / "old.json").exists()
+
+    (tmp_path / "bad.json").write_text("{not json")
+    assert cache.get("bad") is None
+
+
+def test_stats_count_hits_and_misses():
+    cache = InMemoryLLMCache(maxsize=4)
+    cache.set("k", {"v": 1})
+    cache.get("k")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert InMemoryLLMCache().stats()["hit_rate"] is None
@@ -0,0 +1,182 @@
+"""Tests for the pure statistics helpers in app.metrics."""
+
+import statistics
+
+import pytest
+
+from app import metrics
+from app.metrics import (
+    MetricsCollector,
+    OnlineVariance,
+    RunningPercentile,
+    VarianceAggregator,
+    _quantile,
+    aggregate_metrics,
+    compare_metrics,
+    compute_variance_metrics,
+)
+from app.schemas import EvalMetrics, LatencyMetrics, QualityScore, TokenMetrics
+
+
+def _metrics(latency_ms: float, score: float, output_tokens: int = 10) -> EvalMetrics:
+    return EvalMetrics(
+        tokens=TokenMetrics(
+            input_tokens=5,
+            output_tokens=output_tokens,
+            total_tokens=5 + output_tokens
+        ),
+        latency=LatencyMetrics(total_ms=latency_ms),
+        quality=QualityScore(score=score, feedback="")
+    )
+
+
+@pytest.mark.parametrize("q, expected", [
+    (0.0, 1.0),
+    (0.25, 1.75),
+    (0.5, 2.5),
+    (0.95, 3.85),
+    (1.0, 4.0),
+])
+def test_quantile_interpolates_between_ranks(q, expected):
+    assert _quantile([1.0, 2.0, 3.0, 4.0], q) == pytest.approx(expected)
+
+
+def test_quantile_matches_statistics_inclusive():
+    values = sorted([12.5, 3.0, 7.25, 99.0, 41.0, 0.5, 18.0])
+    quartiles = statistics.quantiles(values, n=4, method="inclusive")
+    for q, expected in zip((0.25, 0.5, 0.75), quartiles):
+        assert _quantile(values, q) == pytest.approx(expected)
+
+
+def test_quantile_single_value():
+    assert _quantile([42.0], 0.5) == 42.0
+
+
+def test_running_percentile_matches_quantile():
+    percentiles = RunningPercentile()
+    for x in (5.0, 1.0, 4.0, 2.0, 3.0):
+        percentiles.add(x)
+    assert len(percentiles) == 5
+    assert percentiles.quantile(0.5) == 3.0
+    assert percentiles.quantile(0.95) == pytest.approx(_quantile([1.0, 2.0, 3.0, 4.0, 5.0], 0.95))
+
+
+def test_online_variance_matches_statistics():
+    values = [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]
+    stats = OnlineVariance()
+    for x in values:
+        stats.update(x)
+    assert stats.n == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stdev == pytest.approx(statistics.stdev(values))
+    assert (stats.min, stats.max) == (2.0, 9.0)
+
+
+def test_online_variance_single_value_has_zero_stdev():
+    stats = OnlineVariance()
+    stats.update(3.0)
+    assert stats.stdev == 0.0
+
+
+def test_variance_aggregator():
+    aggregator = VarianceAggregator()
+    for i, latency in enumerate((100.0, 300.0, 200.0)):
+        collector = MetricsCollector(_latency_ms=latency)
+        collector.record_tokens(input_tokens=10, output_tokens=20 + i)
+        aggregator.add(collector, QualityScore(
+            score=6.0 + i,
+            feedback=f"run {i}",
+            criteria_scores={"accuracy": 5.0 + i}
+        ))
+
+    metrics = aggregator.finalize()
+    assert metrics.tokens.input_tokens == 10
+    assert metrics.tokens.output_tokens == 21
+    assert metrics.latency.runs == 3
+    assert (metrics.latency.min_ms, metrics.latency.max_ms) == (100.0, 300.0)
+    assert metrics.latency.p50_ms == 200.0
+    assert metrics.quality.mean_score == 7.0
+    assert metrics.quality.criteria_means == {"accuracy": 6.0}
+
+
+def test_variance_aggregator_p95_needs_five_runs():
+    aggregator = VarianceAggregator()
+    for latency in (500.0, 100.0, 400.0, 200.0, 300.0):
+        aggregator.add(MetricsCollector(_latency_ms=latency), QualityScore(score=5.0, feedback=""))
+    metrics = aggregator.finalize()
+    assert metrics.latency.p50_ms == 300.0
+    assert metrics.latency.p95_ms == 480.0
+
+
+def test_variance_aggregator_needs_a_run():
+    with pytest.raises(ValueError):
+        VarianceAggregator().finalize()
+
+
+def test_compute_variance_metrics():
+    collectors = []
+    for i, ns in enumerate((100_000_000, 300_000_000, 200_000_000)):
+        collector = MetricsCollector(_start_time=0, _end_time=ns)
+        collector.record_tokens(input_tokens=10, output_tokens=20 + i)
+        collectors.append(collector)
+    scores = [
+        QualityScore(score=6.0 + i, feedback=f"run {i}", criteria_scores={"accuracy": 5.0 + i})
+        for i in range(3)
+    ]
+
+    metrics = compute_variance_metrics(collectors, scores)
+    assert metrics.tokens.input_tokens == 10
+    assert metrics.latency.runs == 3
+    assert metrics.latency.mean_ms == 200.0
+    assert metrics.latency.p50_ms == 200.0
+    assert metrics.latency.p95_ms is None
+    assert metrics.latency.std_dev_ms == pytest.approx(100.0)
+    assert metrics.quality.mean_score == 7.0
+    assert metrics.quality.criteria_means == {"accuracy": 6.0}
+    assert metrics.quality.feedbacks == ["run 0", "run 1", "run 2"]
+
+
+def test_aggregate_metrics():
+    summary = aggregate_metrics([
+        _metrics(300.0, 6.0),
+        _metrics(100.0, 8.0),
+        _metrics(200.0, 7.0),
+    ])
+    assert summary["count"] == 3
+    assert summary["latency"] == {
+        "avg_ms": 200.0, "min_ms": 100.0, "max_ms": 300.0, "p50_ms": 200.0
+    }
+    assert summary["tokens"]["total_output"] == 30
+    assert summary["quality"] == {"avg_score": 7.0, "min_score": 6.0, "max_score": 8.0}
+
+
+def test_aggregate_metrics_single_and_empty():
+    assert aggregate_metrics([]) == {}
+    single = aggregate_metrics([_metrics(150.0, 9.0)])
+    assert single["latency"] == {
+        "avg_ms": 150.0, "min_ms": 150.0, "max_ms": 150.0, "p50_ms": 150.0
+    }
+    assert single["quality"]["min_score"] == single["quality"]["max_score"] == 9.0
+    # The shortcut gives what the general path gives for identical results
+    pair = aggregate_metrics([_metrics(150.0, 9.0), _metrics(150.0, 9.0)])
+    assert single["latency"] == pair["latency"]
+    assert single["quality"] == pair["quality"]
+    assert single["throughput"] == pair["throughput"]
+
+
+def test_compare_metrics():
+    comparison = compare_metrics(_metrics(100.0, 8.0, 12), _metrics(300.0, 6.0, 10))
+    assert comparison.overall_winner == "a"
+    assert comparison.confidence == 20.0
+    assert (comparison.faster, comparison.better) == ("a", "a")
+    assert comparison.as_dict()["tokens"] == {"a_output": 12, "b_output": 10, "diff": -2}
+
+
+def test_measure_latency_records_latency_and_ttft(monkeypatch):
+    ticks = iter([1_000_000, 3_000_000, 11_000_000])
+    monkeypatch.setattr(metrics.time, "perf_counter_ns", lambda: next(ticks))
+    collector = MetricsCollector()
+    with collector.measure_latency():
+        collector.mark_first_token()
+    assert collector.time_to_first_token_ms == 2.0
+    assert collector.total_latency_ms == 10.0
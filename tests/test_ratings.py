@@ -0,0 +1,67 @@
+"""Tests for the memory and SQLite ratings backends."""
+
+import pytest
+import pytest_asyncio
+
+from app.ratings import InMemoryRatings, SQLiteRatings, create_ratings_backend
+from app.schemas import HumanRating
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryRatings()
+    else:
+        store = SQLiteRatings(str(tmp_path / "ratings.db"))
+        yield store
+        await store.aclose()
+
+
+def _rating(evaluation_id: str, rating: int, **kwargs) -> HumanRating:
+    return HumanRating(evaluation_id=evaluation_id, rating=rating, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_list_returns_ratings_oldest_first(backend):
+    await backend.append("a", _rating("a", 4, comment="first"))
+    await backend.append("a", _rating("a", 2, rater_id="r2"))
+    await backend.append("b", _rating("b", 5))
+
+    ratings = await backend.list("a")
+    assert [r.rating for r in ratings] == [4, 2]
+    assert ratings[0].comment == "first"
+    assert await backend.list("missing") == []
+
+
+@pytest.mark.asyncio
+async def test_stats_keep_running_totals(backend):
+    assert (await backend.stats())["average_rating"] is None
+    for evaluation_id, rating in [("a", 5), ("a", 3), ("b", 4)]:
+        await backend.append(evaluation_id, _rating(evaluation_id, rating))
+
+    assert await backend.stats() == {
+        "total_evaluations": 2,
+        "total_ratings": 3,
+        "average_rating": 4.0,
+        "distribution": {"3": 1, "4": 1, "5": 1}
+    }
+
+
+@pytest.mark.asyncio
+async def test_sqlite_ratings_survive_reopening(tmp_path):
+    path = str(tmp_path / "ratings.db")
+    store = SQLiteRatings(path)
+    await store.append("a", _rating("a", 3))
+    await store.aclose()
+
+    reopened = SQLiteRatings(path)
+    assert [r.rating for r in await reopened.list("a")] == [3]
+    assert (await reopened.stats())["total_ratings"] == 1
+    await reopened.aclose()
+
+
+def test_create_ratings_backend(monkeypatch):
+    monkeypatch.delenv("RATINGS_BACKEND", raising=False)
+    assert isinstance(create_ratings_backend(), InMemoryRatings)
+    with pytest.raises(ValueError):
+        create_ratings_backend("postgres")
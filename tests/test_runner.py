@@ -0,0 +1,189 @@
+"""Tests for the runner's pure helpers (no API calls)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import runner
+from app.runner import (
+    SemanticCache,
+    _apportion,
+    _parse_packed,
+    _system_message,
+    prompt_seed,
+)
+from app.schemas import EvalPrompt, ExpectedStyle
+
+
+def test_semantic_cache_matches_by_scope_and_threshold():
+    cache = SemanticCache(threshold=0.9)
+    vector = SemanticCache.normalize([3.0, 4.0])
+    cache.set("scope", vector, {"response": "hit"})
+
+    assert cache.get("scope", SemanticCache.normalize([3.0, 4.1])) == {"response": "hit"}
+    assert cache.get("scope", SemanticCache.normalize([4.0, -3.0])) is None
+    assert cache.get("other", vector) is None
+
+
+def test_semantic_cache_prefers_the_closest_entry():
+    cache = SemanticCache(threshold=0.5)
+    cache.set("s", SemanticCache.normalize([1.0, 0.5]), {"response": "far"})
+    cache.set("s", SemanticCache.normalize([1.0, 0.1]), {"response": "near"})
+    assert cache.get("s", SemanticCache.normalize([1.0, 0.0])) == {"response": "near"}
+
+
+def test_semantic_cache_drops_the_oldest_entries():
+    cache = SemanticCache(threshold=0.9, maxsize=1)
+    cache.set("s", [1.0, 0.0], {"response": "old"})
+    cache.set("s", [0.0, 1.0], {"response": "new"})
+    assert cache.get("s", [1.0, 0.0]) is None
+
+
+def test_parse_packed():
+    assert _parse_packed('{"responses": ["a", "b"]}', 2) == ["a", "b"]
+
+
+def test_parse_packed_rejects_unusable_replies():
+    assert _parse_packed("not json", 2) is None
+    assert _parse_packed('["a", "b"]', 2) is None
+    assert _parse_packed('{"answers": ["a", "b"]}', 2) is None
+    assert _parse_packed('{"responses": ["a"]}', 2) is None
+    assert _parse_packed('{"responses": ["a", 2]}', 2) is None
+
+
+def test_apportion_preserves_total():
+    shares = _apportion(100, [1, 2, 3])
+    assert sum(shares) == 100
+    assert shares == [16, 33, 51]
+
+
+def test_apportion_zero_weights_split_evenly():
+    assert _apportion(9, [0, 0, 0]) == [3, 3, 3]
+
+
+def test_prompt_seed_is_stable_32_bit():
+    seed = prompt_seed("hello")
+    assert seed == prompt_seed("hello")
+    assert seed != prompt_seed("hello!")
+    assert 0 <= seed < 2 ** 32
+
+
+def test_system_message_accepts_enum_and_string():
+    assert _system_message(ExpectedStyle.TECHNICAL) is _system_message("technical")
+    assert "technical expert" in _system_message("technical")["content"]
+    assert _system_message("unknown") is _system_message(ExpectedStyle.EDUCATIONAL)
+
+
+@pytest.mark.asyncio
+async def test_quick_eval_cache_is_shared_between_calls(monkeypatch):
+    chat_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        chat_calls.append(request.url.path)
+        return httpx.Response(200, json={
+            "id": "1", "object": "chat.completion", "created": 1, "model": "m",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "Hi!"},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}
+        })
+
+    real_client = httpx.AsyncClient
+
+    def mock_client(**kwargs):
+        kwargs.pop("http2", None)
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(runner.httpx, "AsyncClient", mock_client)
+    monkeypatch.setattr(runner, "_default_response_cache", None)
+
+    first = await runner.quick_eval("hello", api_key="k", use_cache=True, capture_ttft=False)
+    second = await runner.quick_eval("hello", api_key="k", use_cache=True, capture_ttft=False)
+
+    assert first["response"] == second["response"] == "Hi!"
+    assert second["metrics"]["output_tokens"] == 2
+    assert chat_calls == ["/v1/chat/completions"]
+
+
+@pytest.mark.asyncio
+async def test_packed_fallback_stays_within_the_concurrency_limit(monkeypatch):
+    mistral_runner = runner.MistralRunner(api_key="k")
+    in_flight = peak = 0
+
+    async def run_packed(*args):
+        return None  # Reply could not be split
+
+    async def run_prompt(prompt, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if prompt.prompt == "p2":
+            raise RuntimeError("boom")
+        return prompt.prompt.upper(), runner.MetricsCollector()
+
+    monkeypatch.setattr(mistral_runner, "_run_packed", run_packed)
+    monkeypatch.setattr(mistral_runner, "run_prompt", run_prompt)
+    prompts = [EvalPrompt(prompt=f"p{i}") for i in range(4)]
+
+    results = await mistral_runner.run_batch_packed(prompts, pack=2, concurrency=1)
+    assert [r[0] for r in results] == ["P0", "P1", "Error: boom", "P3"]
+    assert isinstance(results[2][2], RuntimeError)
+    assert peak == 1
+    await mistral_runner.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_warmup_is_not_retried_until_the_backoff_passes(monkeypatch):
+    mistral_runner = runner.MistralRunner(api_key="k")
+    now = 1000.0
+    monkeypatch.setattr(runner, "time", SimpleNamespace(monotonic=lambda: now))
+    attempts = []
+
+    async def list_async(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("unreachable")
+
+    monkeypatch.setattr(mistral_runner.client.models, "list_async", list_async)
+
+    await mistral_runner.warmup()
+    await mistral_runner.warmup()
+    assert len(attempts) == 1
+
+    now += runner.WARMUP_RETRY_SECONDS
+    await mistral_runner.warmup()
+    await mistral_runner.warmup()
+    assert len(attempts) == 2  # Succeeded, so never repeated
+    await mistral_runner.aclose()
+
+
+@pytest.mark.asyncio
+async def test_run_batch_grows_concurrency_past_the_initial_limit(monkeypatch):
+    mistral_runner = runner.MistralRunner(api_key="k")
+    in_flight = peak = 0
+
+    async def warmup():
+        pass
+
+    async def run_prompt(prompt, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return prompt.prompt, runner.MetricsCollector()
+
+    monkeypatch.setattr(mistral_runner, "warmup", warmup)
+    monkeypatch.setattr(mistral_runner, "run_prompt", run_prompt)
+    prompts = [EvalPrompt(prompt=f"p{i}") for i in range(100)]
+
+    results = await mistral_runner.run_batch_list(prompts, concurrency=1)
+    assert [r[0] for r in results] == [p.prompt for p in prompts]
+    assert 1 < peak <= runner.MAX_CONNECTIONS
+    await mistral_runner.aclose()